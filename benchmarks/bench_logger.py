@@ -0,0 +1,59 @@
+"""
+CommandLogger throughput: the old open/append/close per entry versus the
+queued writer in each durability mode.
+
+Usage: python benchmarks/bench_logger.py [entries]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "tools"))
+
+from command_logger import DURABILITY_MODES, CommandLogger
+
+
+def run_legacy(log_dir, entries):
+    """One open/write/close per entry, as log_command used to do."""
+    log_file = os.path.join(log_dir, "legacy.log")
+    start = time.perf_counter()
+    for i in range(entries):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write(f"[{timestamp}] [bench] [SUCCESS] dir {i}\n")
+    return time.perf_counter() - start
+
+
+def run_queued(log_dir, entries, durability):
+    logger = CommandLogger(log_dir=log_dir, durability=durability)
+    start = time.perf_counter()
+    for i in range(entries):
+        logger.log_command(f"dir {i}", username="bench")
+    enqueued = time.perf_counter() - start
+    logger.close(timeout=None)
+    return enqueued, time.perf_counter() - start
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        elapsed = run_legacy(log_dir, entries)
+        print(f"{'legacy':<8} {entries / elapsed:>12,.0f} entries/s")
+
+    for durability in DURABILITY_MODES:
+        with tempfile.TemporaryDirectory() as log_dir:
+            enqueued, elapsed = run_queued(log_dir, entries, durability)
+            print(
+                f"{durability:<8} {entries / elapsed:>12,.0f} entries/s written "
+                f"({entries / enqueued:,.0f}/s seen by the caller)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Throughput of the terminal output path: per-line widget writes versus the
+frame-coalesced OutputWriter.
+
+Usage: python benchmarks/bench_output.py [lines]
+Needs a display (or a virtual X server such as Xvfb).
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import scrolledtext
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "tools"))
+
+from output_writer import OutputWriter
+
+
+def legacy_write(widget, text, color):
+    """The original write_to_screen body: one full widget round-trip per line."""
+    widget.config(state=tk.NORMAL)
+    tag_name = f"color_{color}".replace("#", "hex")
+    widget.tag_config(tag_name, foreground=color)
+    widget.insert(tk.END, text + "\n", tag_name)
+    widget.see(tk.END)
+    widget.config(state=tk.DISABLED)
+
+
+def run_legacy(root, widget, lines):
+    start = time.perf_counter()
+    for i in range(lines):
+        legacy_write(widget, f"      file_{i}.txt ({i} bytes)", "white")
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+
+def run_buffered(root, widget, lines):
+    writer = OutputWriter(widget, root)
+    start = time.perf_counter()
+    for i in range(lines):
+        writer.write(f"      file_{i}.txt ({i} bytes)\n", "white")
+    writer.flush()
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipped: no display available ({e})")
+        return 1
+
+    results = {}
+    for name, func in (("per-line", run_legacy), ("coalesced", run_buffered)):
+        widget = scrolledtext.ScrolledText(root)
+        widget.pack()
+        widget.config(state=tk.DISABLED)
+        elapsed = func(root, widget, lines)
+        results[name] = lines / elapsed
+        rate = results[name]
+        print(f"{name:<10} {lines} lines in {elapsed:.3f}s ({rate:,.0f} lines/s)")
+        widget.destroy()
+
+    print(f"speedup    {results['coalesced'] / results['per-line']:.1f}x")
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
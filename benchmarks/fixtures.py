@@ -0,0 +1,150 @@
+"""
+Synthetic, reproducible fixtures for the benchmark suite.
+
+Every fixture is generated from a fixed seed and only once: a marker file
+records the parameters it was built with, so later runs reuse it unless the
+scale changes.
+"""
+
+import os
+import random
+import shutil
+
+SEED = 1234
+
+SCALES = {
+    # What the suite is meant to be run with.
+    "full": {
+        "flat_files": 100_000,
+        "tree_depth": 14,
+        "tree_breadth": 2,
+        "big_file_mb": 1024,
+        "log_lines": 1_000_000,
+    },
+    # Same shapes, small enough for a quick check before a commit.
+    "quick": {
+        "flat_files": 10_000,
+        "tree_depth": 10,
+        "tree_breadth": 2,
+        "big_file_mb": 64,
+        "log_lines": 100_000,
+    },
+}
+
+LOG_NAME = "commands_2000-01-01.log"
+
+
+def _ready(path, params):
+    marker = os.path.join(path, ".fixture")
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            return f.read() == repr(params)
+    except OSError:
+        return False
+
+
+def _mark(path, params):
+    with open(os.path.join(path, ".fixture"), "w", encoding="utf-8") as f:
+        f.write(repr(params))
+
+
+def _fresh_dir(path):
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+
+def flat_dir(base, count):
+    """A directory with count small files of varying size."""
+    path = os.path.join(base, "flat")
+    if _ready(path, count):
+        return path
+    _fresh_dir(path)
+    rng = random.Random(SEED)
+    for i in range(count):
+        with open(os.path.join(path, f"file_{i:06d}.txt"), "wb") as f:
+            f.write(b"x" * rng.randint(0, 512))
+    _mark(path, count)
+    return path
+
+
+def deep_tree(base, depth, breadth):
+    """A complete tree: breadth subdirectories per level, depth levels, 2 files each."""
+    path = os.path.join(base, "tree")
+    params = (depth, breadth)
+    if _ready(path, params):
+        return path
+    _fresh_dir(path)
+    level = [path]
+    for d in range(depth):
+        next_level = []
+        for parent in level:
+            for f in range(2):
+                with open(os.path.join(parent, f"f{f}.txt"), "wb") as out:
+                    out.write(b"data\n")
+            if d < depth - 1:
+                for b in range(breadth):
+                    child = os.path.join(parent, f"d{b}")
+                    os.mkdir(child)
+                    next_level.append(child)
+        level = next_level
+    _mark(path, params)
+    return path
+
+
+def big_file(base, size_mb):
+    """A text file of size_mb MiB made of numbered log-style lines."""
+    path = os.path.join(base, "big")
+    target = os.path.join(path, "big.txt")
+    if _ready(path, size_mb):
+        return target
+    _fresh_dir(path)
+    rng = random.Random(SEED)
+    words = ["alpha", "beta", "gamma", "delta", "ERROR", "WARN", "INFO", "ok"]
+    block = "".join(
+        f"{i:08d} {' '.join(rng.choice(words) for _ in range(8))}\n"
+        for i in range(16384)
+    ).encode()
+    with open(target, "wb") as f:
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+    _mark(path, size_mb)
+    return target
+
+
+def command_log(base, lines):
+    """A log directory holding one day of command log entries, without an index."""
+    path = os.path.join(base, "logs")
+    target = os.path.join(path, LOG_NAME)
+    if _ready(path, lines):
+        return path
+    _fresh_dir(path)
+    rng = random.Random(SEED)
+    users = ["alice", "bob", "carol", "svc"]
+    commands = ["dir", "cd ..", "type notes.txt", "ping example.com", "tree --depth 2"]
+    with open(target, "w", encoding="utf-8", newline="\n") as f:
+        for i in range(lines):
+            seconds = i * 86400 // lines
+            stamp = f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+            status = "ERROR" if rng.random() < 0.05 else "SUCCESS"
+            f.write(
+                f"[2000-01-01 {stamp}] [{rng.choice(users)}] [{status}] "
+                f"{rng.choice(commands)} {i}\n"
+            )
+    _mark(path, lines)
+    return path
+
+
+def build(base, scale="full"):
+    """Create (or reuse) every fixture and return their paths."""
+    params = SCALES[scale]
+    base = os.path.join(base, scale)
+    os.makedirs(base, exist_ok=True)
+    return {
+        "flat": flat_dir(base, params["flat_files"]),
+        "tree": deep_tree(base, params["tree_depth"], params["tree_breadth"]),
+        "big": big_file(base, params["big_file_mb"]),
+        "logs": command_log(base, params["log_lines"]),
+    }
@@ -0,0 +1,317 @@
+"""
+Benchmark suite for the terminal's hot paths.
+
+Times output, dir, tree, type, pipes, command logging, log queries, config
+loading and cold start on synthetic fixtures (see fixtures.py). Everything
+runs headless through BatchShell; the Tk output path and window start-up
+are timed as well when a display is available, or when Xvfb is installed
+to provide a virtual one.
+
+Results are written as JSON and can be compared against a stored baseline:
+
+    python benchmarks/suite.py --quick --save-baseline
+    python benchmarks/suite.py --quick --baseline benchmarks/baseline.json
+
+The second run exits with status 1 if any benchmark's median is slower
+than the baseline by more than --threshold (default 20%).
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import fixtures  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+class Suite:
+    def __init__(self, paths, repeat=3, only=None):
+        """
+        Args:
+            paths (dict): Fixture paths from fixtures.build
+            repeat (int): Timed runs per benchmark; the median is compared
+            only (str): fnmatch pattern selecting benchmarks by name
+        """
+        self.paths = paths
+        self.repeat = repeat
+        self.only = only
+        self.results = {}
+        self.devnull = open(os.devnull, "w")
+        # Keep benchmark runs, including the cold-start subprocesses that
+        # inherit this, out of the real command logs.
+        self.scratch_logs = tempfile.TemporaryDirectory()
+        os.environ["PYTERM_LOG_DIR"] = self.scratch_logs.name
+
+        import main
+        from output_sink import StreamSink
+
+        self.main = main
+        self.shell = main.BatchShell(StreamSink(self.devnull, self.devnull))
+        # Logging every benchmarked command would skew the timings.
+        self.shell.close()
+
+    def bench(self, name, func, setup=None):
+        if self.only and not fnmatch.fnmatch(name, self.only):
+            return
+        runs = []
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            runs.append(timed(func))
+        self.shell.sink.flush()
+        median = statistics.median(runs)
+        self.results[name] = {"median": median, "min": min(runs), "runs": runs}
+        print(
+            f"  {name:<28} {median * 1000:10.1f} ms  (min {min(runs) * 1000:.1f})"
+        )
+
+    def run_headless(self):
+        shell = self.shell
+        main = self.main
+        lister = main.dir_listing.directory_lister
+        flat, tree, big = self.paths["flat"], self.paths["tree"], self.paths["big"]
+        log_dir = self.paths["logs"]
+        log_file = os.path.join(log_dir, fixtures.LOG_NAME)
+
+        def write_lines():
+            for i in range(100_000):
+                shell.write_to_screen(f"      file_{i}.txt ({i} bytes)")
+
+        self.bench("write_to_screen.100k", write_lines)
+        self.bench(
+            "list_files.cold", lambda: shell.list_files(flat), lister.invalidate
+        )
+        self.bench("list_files.warm", lambda: shell.list_files(flat))
+        self.bench("show_tree.deep", lambda: shell.show_tree(tree))
+        self.bench("cat_file.head_10k", lambda: shell.cat_file(f"-n 10000 {big}"))
+        self.bench("cat_file.tail_10k", lambda: shell.cat_file(f"--tail 10000 {big}"))
+        self.bench("cat_file.page", lambda: self.first_pages(big))
+        self.bench(
+            "pipe.findstr_tail",
+            lambda: shell.run_line(f"type {log_file} | findstr ERROR | tail 20"),
+        )
+        self.bench("log_command.100k", self.log_commands)
+
+        logger = main.CommandLogger(log_dir=log_dir, max_bytes=0)
+        try:
+            index = logger.index_path(log_file)
+
+            def drop_index():
+                if os.path.exists(index):
+                    os.remove(index)
+
+            def query():
+                logger.query(grep="ERROR", tail=100, log_files=[fixtures.LOG_NAME])
+
+            self.bench("logs.query.cold", query, drop_index)
+            self.bench("logs.query.warm", query)
+        finally:
+            logger.close()
+
+        self.bench("config.load.cold", self.load_config)
+        loader = main.ConfigLoader()
+        loader.load_json_config(), loader.load_ini_settings(), loader.load_css_theme()
+        self.bench(
+            "config.poll.10k", lambda: [loader.has_changed() for _ in range(10_000)]
+        )
+        self.bench("cold_start.batch", self.cold_start_batch)
+
+    def first_pages(self, path, pages=50):
+        """What scrolling through `type` costs: opening the file and reading pages."""
+        pager = self.main.file_pager.FilePager(path, self.shell.page_lines)
+        try:
+            for _ in range(pages):
+                pager.next_page()
+        finally:
+            pager.close()
+
+    def log_commands(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = self.main.CommandLogger(log_dir=log_dir)
+            for i in range(100_000):
+                logger.log_command(f"dir {i}", username="bench")
+            logger.close(timeout=None)
+
+    def load_config(self):
+        for _ in range(100):
+            loader = self.main.ConfigLoader()
+            loader.load_json_config()
+            loader.load_ini_settings()
+            loader.load_css_theme()
+
+    def cold_start_batch(self):
+        subprocess.run(
+            [sys.executable, os.path.join(REPO_DIR, "main.py"), "-c", "ver"],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+    def run_tk(self):
+        try:
+            import tkinter as tk
+            from output_writer import OutputWriter
+        except ImportError as e:
+            print(f"  skipped Tk benchmarks: {e}")
+            return
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            print(f"  skipped Tk benchmarks: {e}")
+            return
+        try:
+            widget = tk.Text(root)
+            widget.pack()
+
+            def write_lines():
+                writer = OutputWriter(widget, root, max_lines=10_000)
+                for i in range(100_000):
+                    writer.write(f"      file_{i}.txt ({i} bytes)\n", "white")
+                writer.flush()
+                root.update_idletasks()
+
+            self.bench("tk.write.100k", write_lines)
+        finally:
+            root.destroy()
+        self.bench("tk.cold_start", self.cold_start_tk)
+
+    def cold_start_tk(self):
+        script = (
+            "import sys, tkinter; sys.argv = ['main.py']; import main; "
+            "root = tkinter.Tk(); app = main.TkinterCLI(root); root.update(); "
+            "app.close()"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=REPO_DIR,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+
+def start_virtual_display():
+    """Start Xvfb if there is no display; returns the process or None."""
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    display = ":97"
+    process = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    time.sleep(0.5)
+    if process.poll() is not None:
+        return None
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table; returns the names that regressed."""
+    regressions = []
+    print(f"\n  {'benchmark':<28} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:<28} {'-':>10} {result['median'] * 1000:>8.1f}ms")
+            continue
+        change = result["median"] / base["median"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"  {name:<28} {base['median'] * 1000:>8.1f}ms "
+            f"{result['median'] * 1000:>8.1f}ms {change:>+7.0%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="small fixtures")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="fnmatch pattern of benchmarks to run")
+    parser.add_argument(
+        "--fixtures",
+        default=os.path.join(tempfile.gettempdir(), "pyterm-bench-fixtures"),
+        help="where fixtures are generated and reused",
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help=f"also write {DEFAULT_BASELINE}"
+    )
+    parser.add_argument("--no-tk", action="store_true", help="skip the Tk benchmarks")
+    args = parser.parse_args()
+
+    scale = "quick" if args.quick else "full"
+    print(f"Preparing {scale} fixtures in {args.fixtures} ...")
+    start = time.perf_counter()
+    paths = fixtures.build(args.fixtures, scale)
+    print(f"  ready in {time.perf_counter() - start:.1f}s")
+
+    suite = Suite(paths, repeat=args.repeat, only=args.only)
+    print("Headless:")
+    suite.run_headless()
+    if not args.no_tk:
+        xvfb = start_virtual_display()
+        print("Tk:" + (" (Xvfb)" if xvfb else ""))
+        try:
+            suite.run_tk()
+        finally:
+            if xvfb:
+                xvfb.terminate()
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "scale": scale,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": suite.results,
+    }
+    for path in [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else []):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["scale"] != scale:
+            print(f"Baseline was recorded at scale '{baseline['meta']['scale']}'.")
+            return 2
+        regressions = compare(suite.results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
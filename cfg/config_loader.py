@@ -3,14 +3,64 @@ import configparser
 import re
 import os
 
+THEME_DEFAULTS = {
+    "background": "black",
+    "text": "white",
+    "prompt": "green",
+    "error": "red",
+    "caret": "white",
+}
+
+THEME_PATTERNS = {
+    "background": re.compile(r"body\s*{[^}]*background-color:\s*(#[a-fA-F0-9]+)"),
+    "text": re.compile(r"\.terminal-text\s*{[^}]*color:\s*(#[a-fA-F0-9]+)"),
+    "prompt": re.compile(r"\.prompt-symbol\s*{[^}]*color:\s*(#[a-fA-F0-9]+)"),
+    "error": re.compile(r"\.error-msg\s*{[^}]*color:\s*(#[a-fA-F0-9]+)"),
+    "caret": re.compile(r"\.input-area\s*{[^}]*caret-color:\s*(#[a-fA-F0-9]+)"),
+}
+
 
 class ConfigLoader:
-    def __init__(self):
-        self.config_path = "config.json"
-        self.settings_path = "settings.ini"
-        self.theme_path = "theme.css"
+    def __init__(self, base_dir=None):
+        """
+        Loads config.json, settings.ini and theme.css, each parsed once.
+
+        Parsed files are cached against their (mtime, size) stamp, so the
+        load_* methods are cheap to call repeatedly and has_changed() is a
+        stat per file.
+        """
+        self.base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+        self.config_path = os.path.join(self.base_dir, "config.json")
+        self.settings_path = os.path.join(self.base_dir, "settings.ini")
+        self.theme_path = os.path.join(self.base_dir, "theme.css")
+        self._cache = {}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _cached(self, path, parse):
+        stamp = self._stamp(path)
+        cached = self._cache.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, parse())
+            self._cache[path] = cached
+        return cached[1]
 
     def load_json_config(self):
+        return self._cached(self.config_path, self._parse_json)
+
+    def load_ini_settings(self):
+        return self._cached(self.settings_path, self._parse_ini)
+
+    def load_css_theme(self):
+        return self._cached(self.theme_path, self._parse_css)
+
+    def _parse_json(self):
         default_config = {"startup_commands": [], "application": {}}
         if not os.path.exists(self.config_path):
             return default_config
@@ -22,20 +72,17 @@ class ConfigLoader:
             print(f"Error loading JSON: {e}")
             return default_config
 
-    def load_ini_settings(self):
+    def _parse_ini(self):
         config = configparser.ConfigParser()
         if os.path.exists(self.settings_path):
-            config.read(self.settings_path)
+            try:
+                config.read(self.settings_path)
+            except configparser.Error as e:
+                print(f"Error loading INI: {e}")
         return config
 
-    def load_css_theme(self):
-        theme_colors = {
-            "background": "black",
-            "text": "white",
-            "prompt": "green",
-            "error": "red",
-            "caret": "white",
-        }
+    def _parse_css(self):
+        theme_colors = dict(THEME_DEFAULTS)
 
         if not os.path.exists(self.theme_path):
             return theme_colors
@@ -43,38 +90,63 @@ class ConfigLoader:
         try:
             with open(self.theme_path, "r") as f:
                 css_content = f.read()
-
-            bg_match = re.search(
-                r"body\s*{[^}]*background-color:\s*(#[a-fA-F0-9]+)", css_content
-            )
-            if bg_match:
-                theme_colors["background"] = bg_match.group(1)
-
-            text_match = re.search(
-                r"\.terminal-text\s*{[^}]*color:\s*(#[a-fA-F0-9]+)", css_content
-            )
-            if text_match:
-                theme_colors["text"] = text_match.group(1)
-
-            prompt_match = re.search(
-                r"\.prompt-symbol\s*{[^}]*color:\s*(#[a-fA-F0-9]+)", css_content
-            )
-            if prompt_match:
-                theme_colors["prompt"] = prompt_match.group(1)
-
-            err_match = re.search(
-                r"\.error-msg\s*{[^}]*color:\s*(#[a-fA-F0-9]+)", css_content
-            )
-            if err_match:
-                theme_colors["error"] = err_match.group(1)
-
-            input_match = re.search(
-                r"\.input-area\s*{[^}]*caret-color:\s*(#[a-fA-F0-9]+)", css_content
-            )
-            if input_match:
-                theme_colors["caret"] = input_match.group(1)
-
+            for key, pattern in THEME_PATTERNS.items():
+                match = pattern.search(css_content)
+                if match:
+                    theme_colors[key] = match.group(1)
         except Exception as e:
             print(f"Error parsing CSS: {e}")
 
         return theme_colors
+
+    def has_changed(self):
+        """True if any loaded file was modified, created or removed since parsing."""
+        return any(
+            self._stamp(path) != cached[0] for path, cached in self._cache.items()
+        )
+
+    def reload(self):
+        """
+        Re-parse whatever changed on disk.
+
+        Returns:
+            list: "file: key old -> new" lines, empty if nothing changed
+        """
+        stale = {path: cached[1] for path, cached in self._cache.items()}
+        before = self.flatten(
+            stale.get(self.config_path),
+            stale.get(self.settings_path),
+            stale.get(self.theme_path),
+        )
+        after = self.flatten(
+            self.load_json_config(), self.load_ini_settings(), self.load_css_theme()
+        )
+
+        changes = []
+        for key in sorted(before.keys() | after.keys()):
+            old, new = before.get(key), after.get(key)
+            if old != new:
+                changes.append(f"{key}: {old} -> {new}")
+        return changes
+
+    @staticmethod
+    def flatten(json_config, ini_settings, theme):
+        """Settings from all three files as one {"file: key": value} dict."""
+        values = {}
+
+        def walk(prefix, value):
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    walk(f"{prefix}.{key}" if prefix else key, item)
+            else:
+                values[f"config.json: {prefix}"] = value
+
+        if json_config is not None:
+            walk("", json_config)
+        if ini_settings is not None:
+            for section in ini_settings.sections():
+                for key, value in ini_settings.items(section, raw=True):
+                    values[f"settings.ini: {section}.{key}"] = value
+        for key, value in (theme or {}).items():
+            values[f"theme.css: {key}"] = value
+        return values
@@ -1,15 +1,11 @@
+import time
+
+STARTUP_T0 = time.perf_counter()
+
 import os
 import sys
-import shutil
-import platform
-import socket
-import subprocess
-import json
-import configparser
-import re
+import threading
 from datetime import datetime
-import tkinter as tk
-from tkinter import scrolledtext
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(script_dir)
@@ -33,10 +29,22 @@ tools_dir = os.path.join(parent_dir, "tools")
 #
 # print(f"DEBUG: sys.path = {sys.path[:3]}")
 
+if not os.path.exists(tools_dir):
+    tools_dir = os.path.join(script_dir, "tools")
+if os.path.exists(tools_dir) and tools_dir not in sys.path:
+    sys.path.insert(0, tools_dir)
+if not os.path.exists(cfg_dir):
+    cfg_dir = os.path.join(script_dir, "cfg")
+if os.path.exists(cfg_dir) and cfg_dir not in sys.path:
+    sys.path.insert(0, cfg_dir)
+
 try:
     from config_loader import ConfigLoader
 except ImportError as e:
     print(f"Warning: Could not import ConfigLoader: {e}")
+    import configparser
+    import json
+    import re
 
     class ConfigLoader:
         def __init__(self):
@@ -99,24 +107,12 @@ except ImportError as e:
                 print(f"Error loading CSS theme: {e}")
             return theme_colors
 
+        def has_changed(self):
+            return False
 
-try:
-    from network import NetworkTools
-except ImportError as e:
-    print(f"Warning: Could not import NetworkTools: {e}")
-    NetworkTools = None
-
-try:
-    from task_manager import TaskManager
-except ImportError as e:
-    print(f"Warning: Could not import TaskManager: {e}")
-    TaskManager = None
+        def reload(self):
+            return []
 
-try:
-    from file_explorer import FileExplorerPopup
-except ImportError as e:
-    print(f"Warning: Could not import FileExplorerPopup: {e}")
-    FileExplorerPopup = None
 
 try:
     from command_logger import CommandLogger
@@ -124,6 +120,36 @@ except ImportError as e:
     print(f"Warning: Could not import CommandLogger: {e}")
     CommandLogger = None
 
+import host_info
+from command_history import CommandHistory
+from command_registry import CommandRegistry, LazyModule
+
+# Tk and the window-only helpers are not needed by --batch / -c.
+tk = LazyModule("tkinter")
+scrolledtext = LazyModule("tkinter.scrolledtext")
+job_manager = LazyModule("job_manager")
+output_writer = LazyModule("output_writer")
+output_sink = LazyModule("output_sink")
+
+# Command tools are imported the first time one of their commands runs.
+network = LazyModule("network")
+task_manager = LazyModule("task_manager")
+top_view = LazyModule("top_view")
+file_explorer = LazyModule("file_explorer")
+file_pager = LazyModule("file_pager")
+dir_listing = LazyModule("dir_listing")
+tree_walker = LazyModule("tree_walker")
+pipeline = LazyModule("pipeline")
+calculator = LazyModule("calculator")
+tree_remover = LazyModule("tree_remover")
+tree_copier = LazyModule("tree_copier")
+
+MORE_PROMPT = "-- More: scroll down or press Enter to continue --"
+
+registry = CommandRegistry()
+command = registry.command
+source = registry.source
+
 if os.name == "nt":
     os.system("color")
 
@@ -147,100 +173,238 @@ colors = {
 }
 
 
-class TkinterCLI:
-    def __init__(self, root):
-        self.root = root
+class StartupProfile:
+    def __init__(self, start=None):
+        """
+        Per-phase wall-clock timings from process start to the first prompt.
+
+        Phases are recorded unconditionally (one perf_counter call each);
+        the breakdown is only printed when --startup-profile is given.
+        """
+        self.enabled = False
+        self.start = self.last = start if start is not None else time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self, budget_ms=0):
+        if not self.enabled:
+            return
+        total = (self.last - self.start) * 1000
+        print("Startup profile:")
+        for phase, elapsed in self.phases:
+            print(f"  {phase:<20} {elapsed:8.1f} ms")
+        print(f"  {'total':<20} {total:8.1f} ms")
+        if budget_ms and total > budget_ms:
+            over = total - budget_ms
+            print(f"  over the {budget_ms} ms startup budget by {over:.1f} ms")
+
+
+startup_profile = StartupProfile(STARTUP_T0)
+startup_profile.mark("imports")
+
+
+class InlineJob:
+    """
+    Stand-in for a Job when job_manager is unavailable; runs on the UI thread.
+
+    Also used to run a job function inside another job (a pipe source), in
+    which case cancellation and child processes are shared with the parent.
+    """
+
+    def __init__(self, write, parent=None):
+        self.write = write
+        self.parent = parent
+        self.cancelled = parent.cancelled if parent else threading.Event()
+
+    def attach_process(self, process):
+        if self.parent:
+            self.parent.attach_process(process)
+
+
+class CommandShell:
+    """
+    Command core: config, logging, the registered commands, pipes and jobs.
+
+    All output goes through write_to_screen to self.sink, so the same
+    commands run in the window (TkinterCLI) and headless (BatchShell).
+    """
+
+    interactive = False
+
+    def __init__(self, sink=None):
+        """
+        Args:
+            sink: Output sink with write(text, color) and clear(), e.g. an
+                OutputWriter for the window or a StreamSink for stdout
+        """
+        self.sink = sink
         self.current_color = colors["1"]
-      
-        self.logger = (
-            CommandLogger(log_dir=os.path.join(parent_dir, "logs"))
-            if CommandLogger
-            else None
-        )
-        if self.logger:
-            self.logger.log_session_start()
 
         self.loader = ConfigLoader()
         self.json_config = self.loader.load_json_config()
         self.ini_settings = self.loader.load_ini_settings()
         self.theme = self.loader.load_css_theme()
 
-        width = self.ini_settings.get("WindowSettings", "width", fallback="850")
-        height = self.ini_settings.get("WindowSettings", "height", fallback="550")
-        title = self.ini_settings.get(
-            "WindowSettings", "title", fallback="Python Command Prompt"
-        )
-
-        self.root.title(title)
-        self.root.geometry(f"{width}x{height}")
-
-        bg_color = self.theme["background"]
-        text_color = self.theme["text"]
-        caret_color = self.theme["caret"]
+        self.logger = None
+        if CommandLogger:
+            try:
+                self.logger = CommandLogger(
+                    # PYTERM_LOG_DIR sends a run's log elsewhere, e.g. benchmarks.
+                    log_dir=os.environ.get("PYTERM_LOG_DIR")
+                    or os.path.join(parent_dir, "logs"),
+                    flush_interval=self.ini_settings.getint(
+                        "Logging", "flush_interval_ms", fallback=200
+                    )
+                    / 1000,
+                    durability=self.ini_settings.get(
+                        "Logging", "durability", fallback="flush"
+                    ),
+                    max_bytes=self.ini_settings.getint(
+                        "Logging", "max_log_mb", fallback=10
+                    )
+                    * 1024
+                    * 1024,
+                    retention_days=self.ini_settings.getint(
+                        "Logging", "retention_days", fallback=30
+                    ),
+                )
+            except ValueError as e:
+                print(f"Warning: Logging disabled: {e}")
+        if self.logger:
+            self.logger.log_session_start()
 
-        self.root.configure(bg=bg_color)
+        # In memory only; the window swaps in the shared on-disk history.
+        self.history = CommandHistory(
+            max_entries=self.ini_settings.getint(
+                "History", "max_entries", fallback=10000
+            )
+        )
+        self.jobs = None
+        self.calc = None
+        self.pager = None
+        self.capture = None
+        self.failed = False
+        self.page_lines = self.ini_settings.getint(
+            "WindowSettings", "page_lines", fallback=200
+        )
 
-        self.command_history = []
+    def write_to_screen(self, text, color=None):
+        if color == "red":
+            self.failed = True
+        elif self.capture is not None:
+            self.capture.append(text)
+            return
+        self.emit(text, color)
 
-        self.output = scrolledtext.ScrolledText(
-            root,
-            bg=bg_color,
-            fg=text_color,
-            insertbackground=caret_color,
-            font=("Consolas", 11),
-        )
-        self.output.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-        self.output.config(state=tk.DISABLED)
+    def emit(self, text, color):
+        self.sink.write(text + "\n", color)
 
-        self.input_frame = tk.Frame(root, bg=bg_color)
-        self.input_frame.pack(fill=tk.X, padx=10, pady=5)
+    def complete_line(self, line, cached_only=False):
+        """
+        Completion candidates for the last word of a command line.
 
-        self.prompt_label = tk.Label(
-            self.input_frame,
-            text=">",
-            bg=bg_color,
-            fg=self.theme["prompt"],
-            font=("Consolas", 12, "bold"),
-        )
-        self.prompt_label.pack(side=tk.LEFT)
+        The first word completes to command names, later words to paths
+        relative to the current directory. A word after an unclosed quote
+        may contain spaces.
 
-        self.entry = tk.Entry(
-            self.input_frame,
-            bg=bg_color,
-            fg=text_color,
-            insertbackground=caret_color,
-            font=("Consolas", 12),
-            borderwidth=0,
-        )
-        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        self.entry.bind("<Return>", self.process_command)
-        self.entry.focus_set()
+        Args:
+            line (str): Text typed so far
+            cached_only (bool): Return None rather than scan a directory
+                whose name index is not cached yet; it is then indexed on a
+                background thread
 
-        startup_cmds = self.json_config.get("startup_commands", [])
-        if startup_cmds:
-            for cmd in startup_cmds:
-                self.run_silent_command(cmd)
+        Returns:
+            tuple: (text before the word, candidates), or None
+        """
+        quote = line.rfind('"') if line.count('"') % 2 else -1
+        if quote >= 0:
+            start = quote + 1
         else:
-            self.write_to_screen(f"Microsoft Windows [Version {platform.version()}]")
-            self.write_to_screen("(c) Microsoft Corporation. All rights reserved.\n")
-
-    def write_to_screen(self, text, color=None):
-        if color is None:
-            color = self.current_color
+            start = len(line) - len(line.split(" ")[-1])
+        stem, word = line[:start], line[start:]
+        if not stem.strip():
+            return stem, registry.complete(word.lower())
+        if not dir_listing.available():
+            return stem, []
+        head, tail = os.path.split(word)
+        folder = os.path.expanduser(head) if head else os.curdir
+        lister = dir_listing.directory_lister
+        try:
+            names = lister.complete(folder, tail, cached_only)
+        except OSError:
+            return stem, []
+        if names is None:
+            lister.prefetch(folder)
+            return None
+        return stem, [os.path.join(head, name) for name in names]
+
+    def close(self):
+        """End the session: stop jobs, then flush and close history and log."""
+        if self.jobs:
+            self.jobs.shutdown()
+        self.history.close()
+        if self.logger:
+            self.logger.log_session_end()
+            self.logger.close()
+            self.logger = None
+
+    def run_line(self, user_input):
+        """Run one command line: history, a trailing &, pipes, dispatch, logging."""
+        self.history.add(user_input)
+        self.failed = False
+        try:
+            self.dispatch_line(user_input)
+        finally:
+            # Logged once it has run, so the entry records whether it failed;
+            # a background job's own errors come later and are not included.
+            if self.logger:
+                self.logger.log_command(
+                    user_input,
+                    username=host_info.username(),
+                    status="ERROR" if self.failed else "SUCCESS",
+                )
 
-        if color == "red":
-            color = self.theme["error"]
-        elif color == "gray":
-            color = "gray60"
+    def dispatch_line(self, user_input):
+        """Run a command line as typed: a trailing &, pipes, or one command."""
+        background = user_input.endswith("&")
+        if background:
+            user_input = user_input[:-1].rstrip()
+            if not user_input:
+                return
 
-        self.output.config(state=tk.NORMAL)
+        parts = user_input.split(maxsplit=1)
+        cmd = parts[0].lower()
+        args = parts[1] if len(parts) > 1 else ""
 
-        tag_name = f"color_{color}".replace("#", "hex")
-        self.output.tag_config(tag_name, foreground=color)
-        self.output.insert(tk.END, text + "\n", tag_name)
+        if ("|" in user_input or ">" in user_input) and not self.is_calc(cmd):
+            self.run_pipeline(user_input, background)
+            return
 
-        self.output.see(tk.END)
-        self.output.config(state=tk.DISABLED)
+        self.execute_logic(cmd, args, silent=False, background=background)
+
+    @staticmethod
+    def is_calc(cmd):
+        """calc's arguments are an expression, where | and >> are operators."""
+        found, _ = registry.lookup(cmd)
+        return found is not None and found.name == "calc"
+
+    def run_job(self, command, func, background=False):
+        """Run a blocking command on the job pool, or inline if jobs are unavailable."""
+        if self.capture is not None:
+            # Output is being piped; the pipeline runs func on its own job.
+            self.capture.append(func)
+            return None
+        if not self.jobs:
+            func(InlineJob(self.write_to_screen))
+            return None
+        job = self.jobs.submit(command, func, background)
+        if background:
+            self.write_to_screen(f"[{job.id}] {command}", "gray")
+        return job
 
     def run_silent_command(self, full_command):
         parts = full_command.split(maxsplit=1)
@@ -248,140 +412,414 @@ class TkinterCLI:
         args = parts[1] if len(parts) > 1 else ""
         self.execute_logic(cmd, args, silent=True)
 
-    def process_command(self, event):
-        user_input = self.entry.get().strip()
-        self.entry.delete(0, tk.END)
+    def run_pipeline(self, line, background=False):
+        """
+        Run `cmd | filter ... [> file]` with every stage as a generator.
 
-        if not user_input:
+        Commands with a registered pipe source stream their lines; any other
+        command is run once with its output captured. Filters come from
+        tools/pipeline.py, and only the final lines reach the widget.
+        """
+        if not pipeline.available():
+            self.write_to_screen("Pipes are not available.", "red")
+            return
+        try:
+            stages, redirect = pipeline.split_pipeline(line)
+            if stages[-1].lower() == pipeline.PAGER:
+                if redirect or len(stages) == 1:
+                    raise ValueError("'more' must be the last stage of a pipe.")
+                stages.pop()
+                paged = True
+            else:
+                paged = False
+            filters = []
+            for stage in stages[1:]:
+                parts = stage.split(maxsplit=1)
+                name = parts[0].lower()
+                if name not in pipeline.FILTERS:
+                    raise ValueError(f"'{name}' cannot read piped input.")
+                filter_args = parts[1] if len(parts) > 1 else ""
+                filters.append((pipeline.FILTERS[name], filter_args))
+        except ValueError as e:
+            self.write_to_screen(f"Error: {e}", "red")
             return
 
-        self.command_history.append(user_input)
-
-        if self.logger:
-            try:
-                username = os.getlogin()
-            except:
-                username = "unknown"
-            self.logger.log_command(user_input, username=username)
-
-        self.write_to_screen(f"{os.getcwd()}> {user_input}", color=self.theme["prompt"])
-
-        parts = user_input.split(maxsplit=1)
+        parts = stages[0].split(maxsplit=1)
         cmd = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
+        found = self.resolve(cmd)
+        if found is None:
+            return
 
-        self.execute_logic(cmd, args, silent=False)
-
-    def execute_logic(self, cmd, args, silent=False):
-        commands = {
-            "quit": self.root.quit,
-            "q": self.root.quit,
-            "exit": self.root.quit,
-            "help": self.show_help,
-            "h": self.show_help,
-            "clear": self.clear_screen,
-            "cls": self.clear_screen,
-            "date": self.show_date,
-            "time": self.show_time,
-            "ls": self.list_files,
-            "dir": self.list_files,
-            "pwd": self.show_pwd,
-            "echo": lambda: self.write_to_screen(args),
-            "cd": lambda: self.change_directory(args),
-            "mkdir": lambda: self.make_directory(args),
-            "rm": lambda: self.remove_item(args),
-            "del": lambda: self.remove_item(args),
-            "touch": lambda: self.touch_file(args),
-            "color": lambda: self.change_color(args),
-            "colors": self.show_colors,
-            "ver": self.show_ver,
-            "whoami": self.show_whoami,
-            "hostname": self.show_hostname,
-            "type": lambda: self.cat_file(args),
-            "tree": self.show_tree,
-            "systeminfo": self.show_system_info,
-            "calc": lambda: self.run_calc(args),
-            "start": lambda: self.start_file(args),
-            "history": self.show_history,
-            "logs": self.show_logs,
-            "easteregg": lambda: self.write_to_screen("🥚 67 67 67..."),
-        }
-
-        if cmd in commands:
+        if found.name in registry.sources:
+            make_source = registry.sources[found.name]
+        else:
+            self.capture = []
             try:
-                if callable(commands[cmd]):
-                    commands[cmd]()
+                found.invoke(self, args)
             except Exception as e:
                 self.write_to_screen(f"Execution Error: {e}", "red")
+            finally:
+                captured, self.capture = self.capture, None
+
+            def make_source(app, args, job):
+                return self.replay_output(captured, job)
 
-        elif cmd == "ping" and NetworkTools:
-            self.write_to_screen(f"Pinging {args}...")
-            result = NetworkTools.ping(args)
-            self.write_to_screen(result)
+        def build(job):
+            lines = source_lines = make_source(self, args, job)
+            for func, filter_args in filters:
+                lines = func(lines, filter_args)
+            return lines, source_lines
 
-        elif cmd == "ipconfig" and NetworkTools:
-            ip = NetworkTools.get_ip()
-            self.write_to_screen(f"Local IP: {ip}")
+        if paged and self.jobs:
+            pager = pipeline.BackgroundPager(self.page_lines)
+
+            def more_job(job):
+                try:
+                    lines, source_lines = build(job)
+                except ValueError as e:
+                    job.write(f"Error: {e}", "red")
+                    return
+                try:
+                    pager.feed(job, lines, MORE_PROMPT)
+                except (ValueError, OSError) as e:
+                    job.write(f"Error: {e}", "red")
+                finally:
+                    source_lines.close()
+
+            self.close_pager()
+            self.pager = pager
+            pager.next_page()
+            self.run_job(line, more_job)
+            return
 
-        elif cmd == "tasklist" and TaskManager:
-            self.write_to_screen("Fetching process list...")
-            processes = TaskManager.list_processes()
-            self.write_to_screen(processes)
+        if paged:
+            try:
+                lines, source_lines = build(InlineJob(self.write_to_screen))
+            except ValueError as e:
+                self.write_to_screen(f"Error: {e}", "red")
+                return
+            self.start_pager(
+                pipeline.LinePager(lines, self.page_lines, on_close=source_lines.close)
+            )
+            return
 
-        elif cmd == "taskkill" and TaskManager:
-            if not args:
-                self.write_to_screen("Usage: taskkill <name or pid>", "red")
+        def pipeline_job(job):
+            try:
+                lines, source_lines = build(job)
+            except ValueError as e:
+                job.write(f"Error: {e}", "red")
+                return
+            try:
+                if redirect:
+                    mode, path = redirect
+                    with open(path, mode, encoding="utf-8") as out:
+                        count = self.write_lines(job, lines, out)
+                    job.write(f"{count} lines written to {path}", "gray")
+                else:
+                    self.write_lines(job, lines)
+            except (ValueError, OSError) as e:
+                job.write(f"Error: {e}", "red")
+            finally:
+                source_lines.close()
+
+        self.run_job(line, pipeline_job, background)
+
+    def replay_output(self, captured, job):
+        """Lines written by a captured command; its job functions run here."""
+        for item in captured:
+            if callable(item):
+                chunks = []
+                item(InlineJob(lambda text, color=None: chunks.append(text), job))
+                yield from pipeline.split_lines(chunks)
             else:
-                result = TaskManager.kill_process(args)
-                self.write_to_screen(result)
+                yield from item.split("\n")
 
-        elif cmd == "explorer" and FileExplorerPopup:
-            FileExplorerPopup(self.root)
-            self.write_to_screen("Opening File Explorer window...")
+    def write_lines(self, job, lines, out=None):
+        """
+        Send lines to a job's output, or to an open file, one page at a time.
 
+        Returns:
+            int: Number of lines written
+        """
+        count = 0
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= self.page_lines:
+                count += self._emit(job, batch, out)
+                batch = []
+                if job.cancelled.is_set():
+                    return count
+        if batch:
+            count += self._emit(job, batch, out)
+        return count
+
+    @staticmethod
+    def _emit(job, batch, out):
+        if out is None:
+            job.write("\n".join(batch))
         else:
-            if not silent:
+            out.write("\n".join(batch) + "\n")
+        return len(batch)
+
+    def resolve(self, cmd, silent=False):
+        """
+        Look up a command and check that it can run in this shell.
+
+        Returns:
+            Command: The command, or None once the reason it cannot run has
+                been reported (unless silent)
+        """
+        found, candidates = registry.lookup(cmd)
+        if found is None:
+            if silent:
+                return None
+            if candidates:
+                self.write_to_screen(
+                    f"'{cmd}' is ambiguous: {', '.join(candidates)}", "red"
+                )
+            else:
                 self.write_to_screen(f"'{cmd}' is not recognized as a command.", "red")
+            return None
+        if found.requires is not None and not found.requires.available():
+            if not silent:
+                self.write_to_screen(f"'{cmd}' is not available.", "red")
+            return None
+        if found.interactive and not self.interactive:
+            if not silent:
+                self.write_to_screen(f"'{cmd}' needs the window.", "red")
+            return None
+        return found
+
+    def execute_logic(self, cmd, args, silent=False, background=False):
+        found = self.resolve(cmd, silent)
+        if found is None:
+            return
+        try:
+            found.invoke(self, args, background)
+        except Exception as e:
+            self.write_to_screen(f"Execution Error: {e}", "red")
 
+    @command("clear", "cls")
     def clear_screen(self):
-        self.output.config(state=tk.NORMAL)
-        self.output.delete("1.0", tk.END)
-        self.output.config(state=tk.DISABLED)
+        self.clear_output()
+
+    def clear_output(self):
+        self.sink.clear()
+
+    def output_columns(self):
+        try:
+            return os.get_terminal_size().columns
+        except OSError:
+            return 80
+
+    @command("echo")
+    def echo(self, text):
+        self.write_to_screen(text)
+
+    @command("easteregg")
+    def easteregg(self):
+        self.write_to_screen("🥚 67 67 67...")
+
+    @command("ping", requires=network)
+    def run_ping(self, args, background=False):
+        NetworkTools = network.NetworkTools
+        try:
+            options = self.parse_ping_args(args)
+            sweep = options.pop("sweep")
+            hosts = NetworkTools.expand_targets(
+                options.pop("targets"), options.pop("host_file")
+            )
+        except (ValueError, OSError) as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen(
+                "Usage: ping [-f hosts.txt] [--tcp PORT] [--timeout S] "
+                "[--concurrency N] <host|CIDR> ...",
+                "red",
+            )
+            return
+        if not hosts:
+            self.write_to_screen("Error: Specify a host to ping.", "red")
+            return
+
+        if len(hosts) == 1 and not sweep:
+
+            def ping_job(job):
+                job.write(f"Pinging {hosts[0]}...")
+                result = NetworkTools.ping(hosts[0], on_process=job.attach_process)
+                job.write(result)
+
+        else:
+
+            def ping_job(job):
+                job.write(f"Checking {len(hosts)} hosts ({options['probe']})...")
+
+                def report(result):
+                    host, ok, detail = result
+                    if ok:
+                        job.write(f"{host:<40} up    {detail:.2f} ms")
+                    else:
+                        job.write(f"{host:<40} down  {detail}", "red")
+
+                results = NetworkTools.sweep(
+                    hosts, on_result=report, cancelled=job.cancelled, **options
+                )
+                job.write(NetworkTools.summarize(results), "gray")
+
+        self.run_job(f"ping {args}", ping_job, background)
 
+    @command("ipconfig", requires=network)
+    def show_ipconfig(self, args, background=False):
+        NetworkTools = network.NetworkTools
+        if args.strip().lower() == "/all":
+
+            def ipconfig_job(job):
+                job.write(f"Host Name: {NetworkTools.host_facts()['hostname']}")
+                for name, address in NetworkTools.interface_addresses():
+                    job.write(f"  {name:<16} {address}")
+
+        else:
+
+            def ipconfig_job(job):
+                job.write(f"Local IP: {NetworkTools.get_ip()}")
+
+        self.run_job(f"ipconfig {args}".strip(), ipconfig_job, background)
+
+    @command("nslookup", requires=network)
+    def run_nslookup(self, args, background=False):
+        if not args.strip():
+            self.write_to_screen("Usage: nslookup <name>", "red")
+            return
+        name = args.strip()
+
+        def nslookup_job(job):
+            try:
+                addresses, cached = network.NetworkTools.resolve(name)
+            except OSError as e:
+                job.write(f"*** Can't find {name}: {e.strerror or e}", "red")
+                return
+            job.write(f"Name:      {name}" + (" (cached)" if cached else ""))
+            for address in addresses:
+                job.write(f"Address:   {address}")
+
+        self.run_job(f"nslookup {name}", nslookup_job, background)
+
+    @command("tasklist", requires=task_manager)
+    def show_tasklist(self, args, background=False):
+        try:
+            options = self.parse_tasklist_args(args)
+        except ValueError as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen(
+                "Usage: tasklist [/sort:pid|name|mem|cpu|time] "
+                "[/filter:name=PATTERN] [/top N]",
+                "red",
+            )
+            return
+
+        def tasklist_job(job):
+            job.write("Fetching process list...")
+            job.write(task_manager.TaskManager.list_processes(**options))
+
+        self.run_job(f"tasklist {args}".strip(), tasklist_job, background)
+
+    @command("taskkill", requires=task_manager)
+    def kill_tasks(self, args, background=False):
+        options = {"tree": False, "force": False}
+        targets = []
+        for token in args.split():
+            flag = token.lower()
+            if flag == "/t":
+                options["tree"] = True
+            elif flag == "/f":
+                options["force"] = True
+            elif flag not in ("/im", "/pid"):
+                targets.append(token)
+        if not targets:
+            self.write_to_screen(
+                "Usage: taskkill [/t] [/f] <pid or name pattern> ...", "red"
+            )
+            return
+        self.run_job(
+            f"taskkill {args}",
+            lambda job: job.write(
+                task_manager.TaskManager.kill_processes(targets, **options)
+            ),
+            background,
+        )
+
+    @command("help", "h")
     def show_help(self):
         help_text = """Available Commands:
     help, h      - Show this help message
     clear, cls   - Clear the screen
     dir, ls      - List files in directory
+                   /o:n /o:s /o:d sort by name/size/date (/o:-s reverses),
+                   /w wide, /b bare names only
     cd <path>    - Change directory
     pwd          - Show current path
     date, time   - Show current date/time
     mkdir <name> - Create directory
-    rm, del      - Remove file or directory
+    rm, del      - Remove file or directory (-r with contents, --dry-run
+                   to only count; confirm_delete=yes also needs -f)
+    rd, rmdir    - Remove directory (/s with contents, /q no confirm)
+    copy <a> <b> - Copy a file (/u skips it if size and date match)
+    xcopy <a> <b>- Copy a directory's files (/s with subdirectories, /u)
+    move <a> <b> - Move or rename a file or directory
     touch <file> - Create empty file
-    type <file>  - Display file contents
+    type <file>  - Display file contents, one page at a time
+                   -n N first N lines, --tail N last N, --follow new lines
     start <file> - Open file in default app
-    tree         - Show folder structure
+    tree [path]  - Show folder structure (--depth N, --dirs-only,
+                   --ignore PAT, --all to include .git/node_modules)
     ver          - Show OS version
     whoami       - Show current user
     hostname     - Show computer name
     systeminfo   - Show system specs
-    calc <expr>  - Calculate math (e.g. calc 5*5)
+    calc <expr>  - Calculate math (e.g. calc 5*5, calc x = sqrt(ans));
+                   -x/-b/-o for hex/binary/octal, -f FILE for one per line
     color <name> - Change text color
     colors       - List available colors
-    history      - Show command history
+    history [N]  - Show the last N commands (Up/Down recall, Ctrl+R search)
+    reload       - Re-read config.json, settings.ini and theme.css
+    logs         - Query command logs (--since HH:MM, --user, --status,
+                   --grep TEXT, --tail N, --date YYYY-MM-DD, --all)
     explorer     - Opens file explorer (if available)
     ping <host>  - Ping a host (if network tools available)
+                   several hosts, CIDR ranges or -f hosts.txt run a concurrent
+                   sweep (--tcp PORT, --timeout S, --concurrency N)
     ipconfig     - Show local IP (if network tools available)
+                   /all lists every interface address
+    nslookup <n> - Resolve a host name (cached)
+    top          - Live process view (-d SECONDS, -n ROWS; c/m/p sort)
     tasklist     - Show running processes (if task manager available)
-    taskkill     - Kill a process (if task manager available)
+                   /sort:mem|cpu|pid|name|time, /filter:name=PAT, /top N
+    taskkill     - Kill processes by PID or name glob (if task manager
+                   available); /t whole child tree, /f no grace period
+    <cmd> &      - Run ping, tasklist, taskkill, tree or type in background
+    <cmd> | <f>  - Pipe output through findstr/grep PAT (-i -v -n), head N,
+                   tail N, sort (-r -i), wc or more; e.g.
+                   type big.log | findstr ERROR | tail 20
+    <cmd> > file - Write output to a file (>> appends)
+    jobs         - List running and finished jobs
+    kill %<n>    - Stop job number n
+    fg [%<n>]    - Show output of a background job as it arrives
     exit, quit   - Close terminal
+    Commands can be shortened to any unambiguous prefix (e.g. 'hist').
+    Without a window: main.py --batch script.txt, or main.py -c "cmd; cmd"
         """
         self.write_to_screen(help_text, "gray")
+        if registry.plugins:
+            self.write_to_screen(
+                "Plugin commands: " + ", ".join(registry.plugins), "gray"
+            )
 
+    @command("colors")
     def show_colors(self):
         self.write_to_screen("Available colors: " + ", ".join(colors.keys()))
 
+    @command("color")
     def change_color(self, choice):
         choice = choice.lower().strip()
         if choice in colors:
@@ -392,71 +830,327 @@ class TkinterCLI:
                 "Color not found. Use 'colors' to see available colors.", "red"
             )
 
-    def list_files(self):
+    def parse_dir_args(self, args):
+        options = {"order": "n", "format": "long"}
+        path = []
+        for token in args.split():
+            lowered = token.lower()
+            if lowered.startswith("/o"):
+                options["order"] = lowered[2:].lstrip(":") or "n"
+            elif lowered == "/w":
+                options["format"] = "wide"
+            elif lowered == "/b":
+                options["format"] = "bare"
+            elif token.startswith("/") and len(token) == 2:
+                raise ValueError(f"Invalid switch - {token}")
+            else:
+                path.append(token)
+        return options, " ".join(path) or "."
+
+    @command("dir", "ls", requires=dir_listing)
+    def list_files(self, args=""):
         try:
-            items = os.listdir(".")
-            dirs = sorted([d for d in items if os.path.isdir(d)])
-            files = sorted([f for f in items if os.path.isfile(f)])
+            options, path = self.parse_dir_args(args)
+            lister = dir_listing.directory_lister
+            dirs, files = lister.sorted_listing(path, options["order"])
 
             if not dirs and not files:
                 self.write_to_screen("Directory is empty.")
                 return
 
-            for d in dirs:
-                self.write_to_screen(f"<DIR> {d}")
-            for f in files:
-                size = os.path.getsize(f)
-                self.write_to_screen(f"      {f} ({size} bytes)")
+            if options["format"] == "bare":
+                lines = [e.name for e in dirs] + [e.name for e in files]
+            elif options["format"] == "wide":
+                names = [f"[{e.name}]" for e in dirs] + [e.name for e in files]
+                width = max(len(name) for name in names) + 2
+                per_row = max(1, self.output_columns() // width)
+                lines = [
+                    "".join(name.ljust(width) for name in names[i : i + per_row])
+                    for i in range(0, len(names), per_row)
+                ]
+            else:
+                lines = [f"<DIR> {e.name}" for e in dirs]
+                lines += [f"      {e.name} ({e.size} bytes)" for e in files]
+            self.write_to_screen("\n".join(lines))
         except PermissionError:
             self.write_to_screen("Error: Permission denied.", "red")
+        except FileNotFoundError:
+            self.write_to_screen("The system cannot find the path specified.", "red")
         except Exception as e:
             self.write_to_screen(f"Error: {e}", "red")
 
-    def show_tree(self):
-        self.write_to_screen(f"Folder PATH listing for volume {os.getcwd()}")
+    def parse_tasklist_args(self, args):
+        options = {"sort": "pid", "name_filter": None, "top": None}
+        tokens = args.split()
+        while tokens:
+            token = tokens.pop(0)
+            lowered = token.lower()
+            if lowered.startswith("/sort:"):
+                options["sort"] = lowered[6:]
+            elif lowered.startswith("/filter:"):
+                field, _, value = token[8:].partition("=")
+                if field.lower() != "name" or not value:
+                    raise ValueError("Only /filter:name=PATTERN is supported.")
+                options["name_filter"] = value
+            elif lowered.startswith("/top"):
+                value = lowered[5:] if lowered.startswith("/top:") else ""
+                if not value and tokens:
+                    value = tokens.pop(0)
+                if not value.isdigit():
+                    raise ValueError("/top needs a number.")
+                options["top"] = int(value)
+            else:
+                raise ValueError(f"Invalid argument '{token}'.")
+        return options
+
+    def parse_ping_args(self, args):
+        options = {
+            "targets": [],
+            "host_file": None,
+            "probe": "icmp",
+            "port": 80,
+            "timeout": 1.0,
+            "concurrency": 64,
+            "sweep": False,
+        }
+        tokens = args.split()
+        while tokens:
+            token = tokens.pop(0)
+            if token in ("-f", "--tcp", "--timeout", "--concurrency"):
+                if not tokens:
+                    raise ValueError(f"Option '{token}' needs a value.")
+                value = tokens.pop(0)
+                options["sweep"] = True
+                if token == "-f":
+                    options["host_file"] = value
+                elif token == "--tcp":
+                    options["probe"] = "tcp"
+                    options["port"] = int(value)
+                elif token == "--timeout":
+                    options["timeout"] = float(value)
+                else:
+                    options["concurrency"] = max(1, int(value))
+            elif token.startswith("-"):
+                raise ValueError(f"Unknown option '{token}'.")
+            else:
+                if "/" in token:
+                    options["sweep"] = True
+                options["targets"].append(token)
+        return options
+
+    def parse_tree_args(self, args):
+        options = {
+            "depth": None,
+            "dirs_only": False,
+            "ignore": list(tree_walker.DEFAULT_IGNORE),
+        }
+        tokens = args.split()
+        path = []
+        while tokens:
+            token = tokens.pop(0)
+            if token in ("--depth", "-L"):
+                if not tokens or not tokens[0].isdigit():
+                    raise ValueError(f"Option '{token}' needs a number.")
+                options["depth"] = int(tokens.pop(0))
+            elif token in ("--dirs-only", "-d"):
+                options["dirs_only"] = True
+            elif token in ("--ignore", "-I"):
+                if not tokens:
+                    raise ValueError(f"Option '{token}' needs a pattern.")
+                options["ignore"].append(tokens.pop(0))
+            elif token == "--all":
+                options["ignore"] = []
+            elif token.startswith("-"):
+                raise ValueError(f"Unknown option '{token}'.")
+            else:
+                path.append(token)
+        return options, " ".join(path) or "."
+
+    @command("tree", requires=tree_walker)
+    def show_tree(self, args, background=False):
         try:
-            for root_dir, dirs, files in os.walk(".", topdown=True):
-                level = root_dir.replace(".", "", 1).count(os.sep)
-                indent = "|   " * level
-                dirname = os.path.basename(root_dir) or "."
-                self.write_to_screen(f"{indent}|-- {dirname}/")
-                subindent = "|   " * (level + 1)
-                for f in files:
-                    if level < 2:
-                        self.write_to_screen(f"{subindent}|-- {f}")
-        except Exception as e:
+            options, path = self.parse_tree_args(args)
+        except ValueError as e:
             self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen(
+                "Usage: tree [path] [--depth N] [--dirs-only] [--ignore PAT] [--all]",
+                "red",
+            )
+            return
+        if not os.path.isdir(path):
+            self.write_to_screen("The system cannot find the path specified.", "red")
+            return
+        walker = self.make_walker(options, path)
+        self.run_job(
+            f"tree {args}".strip(),
+            lambda job: self.stream_tree(job, walker),
+            background,
+        )
 
-    def cat_file(self, filename):
-        if not filename:
+    @staticmethod
+    def make_walker(options, path):
+        return tree_walker.TreeWalker(
+            os.path.abspath(path),
+            max_depth=options["depth"],
+            dirs_only=options["dirs_only"],
+            ignore=options["ignore"],
+        )
+
+    def stream_tree(self, job, walker):
+        """Worker for tree; output leaves in chunks while the walk is still running."""
+        job.write(f"Folder PATH listing for volume {walker.root}")
+        self.write_lines(job, walker.walk(job.cancelled))
+        job.write(walker.summary(), "gray")
+
+    @source("tree")
+    def tree_lines(self, args, job):
+        options, path = self.parse_tree_args(args)
+        if not os.path.isdir(path):
+            raise ValueError("The system cannot find the path specified.")
+        walker = self.make_walker(options, path)
+
+        def lines():
+            yield f"Folder PATH listing for volume {walker.root}"
+            yield from walker.walk(job.cancelled)
+            yield walker.summary()
+
+        return lines()
+
+    def parse_type_args(self, args):
+        options = {"lines": None, "tail": None, "follow": False}
+        rest = args.strip()
+        while rest.startswith("-"):
+            parts = rest.split(maxsplit=1)
+            flag = parts[0]
+            rest = parts[1] if len(parts) > 1 else ""
+            if flag in ("-f", "--follow"):
+                options["follow"] = True
+                continue
+            if flag not in ("-n", "--tail"):
+                raise ValueError(f"Unknown option '{flag}'.")
+            parts = rest.split(maxsplit=1)
+            if not parts or not parts[0].isdigit():
+                raise ValueError(f"Option '{flag}' needs a line count.")
+            options["lines" if flag == "-n" else "tail"] = int(parts[0])
+            rest = parts[1] if len(parts) > 1 else ""
+        return options, rest
+
+    @command("type", requires=file_pager)
+    def cat_file(self, args, background=False):
+        if not args:
             self.write_to_screen("Error: Specify a file name.", "red")
             return
         try:
-            if not os.path.exists(filename):
-                self.write_to_screen(f"Error: File '{filename}' not found.", "red")
-                return
-            if not os.path.isfile(filename):
-                self.write_to_screen(f"Error: '{filename}' is not a file.", "red")
-                return
-            with open(filename, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-                if content:
-                    self.write_to_screen(content)
-                else:
-                    self.write_to_screen("(File is empty)")
-        except Exception as e:
-            self.write_to_screen(f"Error reading file: {e}", "red")
-
-    def start_file(self, filename):
+            options, filename = self.parse_type_args(args)
+        except ValueError as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen(
+                "Usage: type [-n N | --tail N] [--follow] <file>", "red"
+            )
+            return
         if not filename:
-            self.write_to_screen("Error: Specify a file to open.", "red")
+            self.write_to_screen("Error: Specify a file name.", "red")
             return
-        try:
-            if not os.path.exists(filename):
-                self.write_to_screen(f"Error: '{filename}' not found.", "red")
-                return
-            if os.name == "nt":
-                os.startfile(filename)
+        if not os.path.exists(filename):
+            self.write_to_screen(f"Error: File '{filename}' not found.", "red")
+            return
+        if not os.path.isfile(filename):
+            self.write_to_screen(f"Error: '{filename}' is not a file.", "red")
+            return
+
+        path = os.path.abspath(filename)
+        if not options["follow"] and options["lines"] is options["tail"] is None:
+            self.open_pager(path)
+            return
+
+        job = self.run_job(
+            f"type {args}",
+            lambda job: self.stream_file(job, path, options),
+            background,
+        )
+        if job and options["follow"]:
+            self.write_to_screen(
+                f"[{job.id}] Following {filename}. Use 'kill %{job.id}' to stop.",
+                "gray",
+            )
+
+    def stream_file(self, job, path, options):
+        """Worker for type -n/--tail/--follow; memory stays bounded by the line count."""
+        for page in self.file_pages(path, options, job.cancelled):
+            job.write("\n".join(page))
+
+    def file_pages(self, path, options, cancelled):
+        """
+        Yield a file's lines a page at a time, as selected by type's options.
+
+        Without -n/--tail the whole file is read, or the last 10 lines when
+        following; --follow then yields each appended line as its own page.
+        """
+        with file_pager.MappedFile(path) as mapped:
+            count = options["lines"]
+            offset = 0
+            tail = options["tail"]
+            if tail is None and count is None and options["follow"]:
+                tail = 10
+            if tail is not None:
+                offset, count = mapped.tail_offset(tail), tail
+            while (count is None or count > 0) and not cancelled.is_set():
+                size = self.page_lines if count is None else min(count, self.page_lines)
+                lines, offset = mapped.read_lines(offset, size)
+                if not lines:
+                    break
+                yield lines
+                if count is not None:
+                    count -= len(lines)
+            end = mapped.size
+        if options["follow"]:
+            for line in file_pager.follow(path, cancelled, start_offset=end):
+                yield [line]
+
+    @source("type")
+    def type_lines(self, args, job):
+        options, filename = self.parse_type_args(args)
+        if not os.path.isfile(filename):
+            raise ValueError(f"File '{filename}' not found.")
+        pages = self.file_pages(os.path.abspath(filename), options, job.cancelled)
+
+        def lines():
+            for page in pages:
+                yield from page
+
+        return lines()
+
+    def open_pager(self, path):
+        """Without a window there is nothing to page; stream the whole file."""
+        options = {"lines": None, "tail": None, "follow": False}
+        self.run_job(
+            f"type {path}",
+            lambda job: self.stream_file(job, path, options),
+        )
+
+    def start_pager(self, pager):
+        try:
+            while pager.has_more():
+                self.write_to_screen("\n".join(pager.next_page()))
+        finally:
+            pager.close()
+
+    def close_pager(self):
+        pass
+
+    @command("start")
+    def start_file(self, filename):
+        if not filename:
+            self.write_to_screen("Error: Specify a file to open.", "red")
+            return
+        try:
+            if not os.path.exists(filename):
+                self.write_to_screen(f"Error: '{filename}' not found.", "red")
+                return
+            import subprocess
+
+            if os.name == "nt":
+                os.startfile(filename)
             elif sys.platform == "darwin":
                 subprocess.call(["open", filename])
             else:
@@ -465,6 +1159,7 @@ class TkinterCLI:
         except Exception as e:
             self.write_to_screen(f"Error starting file: {e}", "red")
 
+    @command("cd")
     def change_directory(self, path):
         try:
             target = path if path else os.path.expanduser("~")
@@ -480,6 +1175,7 @@ class TkinterCLI:
         except Exception as e:
             self.write_to_screen(f"Error: {e}", "red")
 
+    @command("mkdir")
     def make_directory(self, names):
         if not names:
             self.write_to_screen("Error: Specify a directory name.", "red")
@@ -495,24 +1191,72 @@ class TkinterCLI:
             except Exception as e:
                 self.write_to_screen(f"Error: {e}", "red")
 
-    def remove_item(self, path):
+    REMOVE_FLAGS = {
+        "-r": ("recursive",),
+        "-R": ("recursive",),
+        "--recursive": ("recursive",),
+        "/s": ("recursive",),
+        "-f": ("force",),
+        "/q": ("force",),
+        "-rf": ("recursive", "force"),
+        "-fr": ("recursive", "force"),
+        "--dry-run": ("dry_run",),
+    }
+
+    def parse_remove_args(self, args):
+        """Split leading rm/rd flags from the path; returns (set of options, path)."""
+        options = set()
+        path = args.strip()
+        while path:
+            flag, _, rest = path.partition(" ")
+            key = flag.lower() if flag.startswith("/") else flag
+            if key not in self.REMOVE_FLAGS:
+                break
+            options.update(self.REMOVE_FLAGS[key])
+            path = rest.strip()
+        return options, path
+
+    @command("rm", "del")
+    def remove_item(self, args, background=False):
+        options, path = self.parse_remove_args(args)
         if not path:
             self.write_to_screen("Error: Specify a file or directory to remove.", "red")
             return
+        self.remove_path(path, options, background)
+
+    @command("rd", "rmdir")
+    def remove_directory(self, args, background=False):
+        options, path = self.parse_remove_args(args)
+        if not path:
+            self.write_to_screen("Error: Specify a directory to remove.", "red")
+            return
+        if os.path.lexists(path) and not os.path.isdir(path):
+            self.write_to_screen(f"The directory name is invalid: {path}", "red")
+            return
+        self.remove_path(path, options, background)
+
+    def remove_path(self, path, options, background=False):
         try:
-            if not os.path.exists(path):
+            if not os.path.lexists(path):
                 self.write_to_screen(f"Could not find {path}", "red")
                 return
-            if os.path.isdir(path):
+            is_dir = os.path.isdir(path) and not os.path.islink(path)
+            if is_dir and "recursive" in options:
+                self.remove_tree(path, options, background)
+            elif "dry_run" in options:
+                kind = "directory" if is_dir else "file"
+                self.write_to_screen(f"Would delete {kind}: {path}")
+            elif is_dir:
                 os.rmdir(path)
                 self.write_to_screen(f"Deleted directory: {path}")
-            elif os.path.isfile(path):
+            else:
                 os.remove(path)
                 self.write_to_screen(f"Deleted file: {path}")
         except OSError as e:
             if "not empty" in str(e).lower():
                 self.write_to_screen(
-                    f"Error: Directory not empty. Use rmdir or delete files first.",
+                    "Error: Directory not empty. Use rm -r or rd /s to remove it "
+                    "with its contents.",
                     "red",
                 )
             else:
@@ -520,6 +1264,213 @@ class TkinterCLI:
         except Exception as e:
             self.write_to_screen(f"Error: {e}", "red")
 
+    def remove_tree(self, path, options, background=False):
+        """rm -r / rd /s: delete a directory tree on a worker pool, as a job."""
+        if not tree_remover.available():
+            self.write_to_screen("Recursive delete is not available.", "red")
+            return
+        target = os.path.realpath(path)
+        cwd = os.path.realpath(os.getcwd())
+        if os.path.dirname(target) == target or cwd == target:
+            self.write_to_screen(f"Refusing to remove '{path}'.", "red")
+            return
+        if cwd.startswith(target.rstrip(os.sep) + os.sep):
+            self.write_to_screen(
+                f"Refusing to remove '{path}': it contains the current directory.",
+                "red",
+            )
+            return
+        dry_run = "dry_run" in options
+        confirm = self.ini_settings.getboolean(
+            "FileSystem", "confirm_delete", fallback=False
+        )
+        if confirm and "force" not in options:
+            # No prompt to answer in a command line: show what would go instead.
+            dry_run = True
+        workers = self.ini_settings.getint("FileSystem", "delete_workers", fallback=8)
+
+        def rm_job(job):
+            remover = tree_remover.TreeRemover(path, workers, dry_run, job.cancelled)
+            verb = "Would remove" if dry_run else "Removed"
+
+            def progress(remover):
+                job.write(
+                    f"  {verb.lower()} {remover.files:,} files "
+                    f"({remover.bytes:,} bytes) so far...",
+                    "gray",
+                )
+
+            remover.run(progress)
+            self.report_errors(job, remover)
+            job.write(
+                f"{verb} {remover.files:,} files and {remover.dirs:,} directories "
+                f"({remover.bytes:,} bytes) from {path}."
+            )
+            if dry_run and "dry_run" not in options:
+                job.write("confirm_delete is on: add -f (rm) or /q (rd) to delete.")
+
+        self.run_job(f"rm -r {path}", rm_job, background)
+
+    @staticmethod
+    def report_errors(job, worker):
+        """Write the errors a TreeRemover or TreeCopier collected."""
+        for message in worker.errors:
+            job.write(f"Error: {message}", "red")
+        hidden = worker.error_count - len(worker.errors)
+        if hidden:
+            job.write(f"... and {hidden} more errors", "red")
+
+    def parse_copy_args(self, args, flags):
+        """
+        Split copy/xcopy/move arguments into flags and paths.
+
+        Double quotes group a path with spaces; -u and -r stand for /u and /s.
+
+        Returns:
+            tuple: (set of flags, list of paths), or None on unbalanced quotes
+        """
+        import shlex
+
+        try:
+            tokens = shlex.split(args, posix=False)
+        except ValueError:
+            return None
+        options = set()
+        paths = []
+        for token in tokens:
+            flag = {"-u": "/u", "-r": "/s"}.get(token, token.lower())
+            if flag in flags:
+                options.add(flag)
+            else:
+                paths.append(token.strip('"'))
+        return options, paths
+
+    def copy_target(self, src, dst):
+        """Where src ends up for copy/move: inside dst when dst is a directory."""
+        if os.path.isdir(dst):
+            return os.path.join(dst, os.path.basename(os.path.normpath(src)))
+        return dst
+
+    @command("copy", "cp", requires=tree_copier)
+    def copy_item(self, args, background=False):
+        parsed = self.parse_copy_args(args, {"/u", "/y"})
+        if parsed is None or len(parsed[1]) != 2:
+            self.write_to_screen("Usage: copy [/u] <source> <destination>", "red")
+            return
+        options, (src, dst) = parsed
+        if not os.path.exists(src):
+            self.write_to_screen(f"Could not find {src}", "red")
+            return
+        if os.path.isdir(src):
+            self.write_to_screen("Use xcopy /s to copy a directory.", "red")
+            return
+        dst = self.copy_target(src, dst)
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            self.write_to_screen("The file cannot be copied onto itself.", "red")
+            return
+        self.run_copy(src, dst, "/u" in options, True, background)
+
+    @command("xcopy", requires=tree_copier)
+    def xcopy_items(self, args, background=False):
+        parsed = self.parse_copy_args(args, {"/s", "/e", "/u", "/y", "/i"})
+        if parsed is None or len(parsed[1]) != 2:
+            self.write_to_screen(
+                "Usage: xcopy [/s] [/u] <source directory> <destination>", "red"
+            )
+            return
+        options, (src, dst) = parsed
+        if not os.path.isdir(src):
+            self.copy_item(args, background)
+            return
+        if os.path.exists(dst) and not os.path.isdir(dst):
+            self.write_to_screen(f"Error: {dst} is not a directory.", "red")
+            return
+        source = os.path.realpath(src).rstrip(os.sep) + os.sep
+        if (os.path.realpath(dst) + os.sep).startswith(source):
+            self.write_to_screen("Cannot copy a directory into itself.", "red")
+            return
+        recursive = bool(options & {"/s", "/e"})
+        self.run_copy(src, dst, "/u" in options, recursive, background)
+
+    def copy_progress(self, job):
+        """progress callback for TreeCopier: files, MB and the current MB/s."""
+        last = [time.perf_counter(), 0]
+
+        def progress(copier):
+            now = time.perf_counter()
+            rate = (copier.bytes - last[1]) / max(now - last[0], 1e-6)
+            last[:] = [now, copier.bytes]
+            job.write(
+                f"  {copier.files:,} files, {copier.bytes / 2**20:,.1f} MB "
+                f"({rate / 2**20:,.1f} MB/s)...",
+                "gray",
+            )
+
+        return progress
+
+    def run_copy(self, src, dst, update, recursive=True, background=False):
+        workers = self.ini_settings.getint("FileSystem", "copy_workers", fallback=4)
+
+        def copy_job(job):
+            start = time.perf_counter()
+            copier = tree_copier.TreeCopier(
+                src, dst, workers, recursive, update, job.cancelled
+            )
+            copier.run(self.copy_progress(job))
+            self.report_errors(job, copier)
+            summary = (
+                f"{copier.files:,} file(s) copied "
+                f"({copier.bytes / 2**20:,.1f} MB in "
+                f"{time.perf_counter() - start:.1f}s)"
+            )
+            if update:
+                summary += f", {copier.skipped:,} unchanged"
+            job.write(summary + ".")
+
+        self.run_job(f"copy {src} {dst}", copy_job, background)
+
+    @command("move", "mv", requires=tree_copier)
+    def move_item(self, args, background=False):
+        parsed = self.parse_copy_args(args, {"/y"})
+        if parsed is None or len(parsed[1]) != 2:
+            self.write_to_screen("Usage: move <source> <destination>", "red")
+            return
+        src, dst = parsed[1]
+        if not os.path.lexists(src):
+            self.write_to_screen(f"Could not find {src}", "red")
+            return
+        dst = self.copy_target(src, dst)
+        is_dir = os.path.isdir(src) and not os.path.islink(src)
+        if is_dir and os.path.lexists(dst):
+            self.write_to_screen(f"Cannot move: {dst} already exists.", "red")
+            return
+        try:
+            if tree_copier.move(src, dst):
+                self.write_to_screen(f"Moved: {src} -> {dst}")
+                return
+        except OSError as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            return
+        if not tree_remover.available():
+            self.write_to_screen("Cannot move across drives here.", "red")
+            return
+        workers = self.ini_settings.getint("FileSystem", "copy_workers", fallback=4)
+
+        def move_job(job):
+            # Another filesystem: copy, then delete the source if nothing failed.
+            copier = tree_copier.TreeCopier(src, dst, workers, cancelled=job.cancelled)
+            if not copier.run(self.copy_progress(job)):
+                self.report_errors(job, copier)
+                job.write("Move incomplete; the source was left in place.", "red")
+                return
+            remover = tree_remover.TreeRemover(src, cancelled=job.cancelled)
+            remover.run()
+            self.report_errors(job, remover)
+            job.write(f"Moved: {src} -> {dst} ({copier.files:,} files)")
+
+        self.run_job(f"move {src} {dst}", move_job, background)
+
+    @command("touch")
     def touch_file(self, names):
         if not names:
             self.write_to_screen("Error: Specify a file name.", "red")
@@ -532,85 +1483,867 @@ class TkinterCLI:
             except Exception as e:
                 self.write_to_screen(f"Error: {e}", "red")
 
-    def run_calc(self, expression):
+    @command("calc", requires=calculator)
+    def run_calc(self, args, background=False):
+        expression = args.strip()
+        base = 10
+        while True:
+            flag, _, rest = expression.partition(" ")
+            if flag in ("-x", "-b", "-o"):
+                base = {"-x": 16, "-b": 2, "-o": 8}[flag]
+                expression = rest.strip()
+            elif flag == "-f" and rest.strip():
+                self.run_calc_file(rest.strip(), base, background)
+                return
+            else:
+                break
         if not expression:
             self.write_to_screen("Error: Provide a math expression.", "red")
             return
-        try:
-            allowed_chars = "0123456789+-*/(). "
-            if all(c in allowed_chars for c in expression):
-                result = eval(expression)
-                self.write_to_screen(f"= {result}")
-            else:
-                self.write_to_screen(
-                    "Error: Invalid characters in math expression.", "red"
-                )
-        except ZeroDivisionError:
-            self.write_to_screen("Math Error: Division by zero.", "red")
-        except Exception as e:
-            self.write_to_screen(f"Math Error: {e}", "red")
+        if self.calc is None:
+            self.calc = self.new_calculator()
+        engine = self.calc
+
+        def calc_job(job):
+            # On the job pool, so even a slow expression never holds up the
+            # window; the engine's own limits stop it soon after.
+            try:
+                result = engine.evaluate(expression)
+                job.write(f"= {calculator.format_result(result, base)}")
+            except ZeroDivisionError:
+                job.write("Math Error: Division by zero.", "red")
+            except ValueError as e:
+                job.write(f"Math Error: {e}", "red")
+
+        self.run_job(f"calc {expression}", calc_job, background)
+
+    def new_calculator(self):
+        return calculator.Calculator(
+            max_digits=self.ini_settings.getint(
+                "Calculator", "max_digits", fallback=4300
+            ),
+            timeout=self.ini_settings.getint("Calculator", "timeout_ms", fallback=1000)
+            / 1000,
+        )
+
+    def run_calc_file(self, path, base, background=False):
+        """calc -f: evaluate a file of expressions, one per line, as a job."""
+        # Its own calculator, so the job never races the interactive `ans`.
+        engine = self.new_calculator()
+
+        def calc_job(job):
+            results = []
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for number, line in enumerate(f, 1):
+                        if job.cancelled.is_set():
+                            return
+                        line = line.strip()
+                        if not line or line.startswith("#"):
+                            continue
+                        try:
+                            value = engine.evaluate(line)
+                            value = calculator.format_result(value, base)
+                            results.append(f"{line} = {value}")
+                        except (ValueError, ZeroDivisionError) as e:
+                            if results:
+                                job.write("\n".join(results))
+                                results = []
+                            job.write(f"Line {number}: {e}", "red")
+                        if len(results) >= self.page_lines:
+                            job.write("\n".join(results))
+                            results = []
+            except OSError as e:
+                job.write(f"Error: Cannot read {path}: {e}", "red")
+                return
+            if results:
+                job.write("\n".join(results))
+
+        self.run_job(f"calc -f {path}", calc_job, background)
 
+    def host_facts(self):
+        """Static host details, computed once per session."""
+        return host_info.host_facts()
+
+    @command("ver")
     def show_ver(self):
-        self.write_to_screen(f"Microsoft Windows [Version {platform.version()}]")
+        self.write_to_screen(
+            f"Microsoft Windows [Version {self.host_facts()['version']}]"
+        )
 
+    @command("whoami")
     def show_whoami(self):
-        try:
-            username = os.getlogin()
-            hostname = platform.node()
-            self.write_to_screen(f"{hostname}\\{username}")
-        except Exception:
-            self.write_to_screen(f"{platform.node()}\\unknown")
+        facts = self.host_facts()
+        self.write_to_screen(f"{facts['node']}\\{facts['username']}")
 
+    @command("hostname")
     def show_hostname(self):
-        self.write_to_screen(socket.gethostname())
+        self.write_to_screen(self.host_facts()["hostname"])
 
+    @command("systeminfo")
     def show_system_info(self):
-        self.write_to_screen(f"Host Name:             {socket.gethostname()}")
-        self.write_to_screen(f"OS Name:               {platform.system()}")
-        self.write_to_screen(f"OS Version:            {platform.version()}")
-        self.write_to_screen(f"System Type:           {platform.machine()}")
+        facts = self.host_facts()
         self.write_to_screen(
-            f"Processor:             {platform.processor() or 'Unknown'}"
+            "\n".join(
+                [
+                    f"Host Name:             {facts['hostname']}",
+                    f"OS Name:               {facts['system']}",
+                    f"OS Version:            {facts['version']}",
+                    f"System Type:           {facts['machine']}",
+                    f"Processor:             {facts['processor']}",
+                ]
+            )
         )
 
+    @command("date")
     def show_date(self):
         self.write_to_screen(
             f"The current date is: {datetime.now().strftime('%A %m/%d/%Y')}"
         )
 
+    @command("time")
     def show_time(self):
         self.write_to_screen(
             f"The current time is: {datetime.now().strftime('%H:%M:%S.%f')[:-4]}"
         )
 
+    @command("pwd")
     def show_pwd(self):
         self.write_to_screen(os.getcwd())
 
-    def show_history(self):
-        if not self.command_history:
+    @command("history")
+    def show_history(self, args):
+        entries = self.history.entries()
+        if not entries:
             self.write_to_screen("No command history.")
             return
-        for idx, cmd in enumerate(self.command_history, 1):
-            self.write_to_screen(f"{idx}: {cmd}")
+        count = len(entries)
+        if args.strip():
+            try:
+                count = int(args.strip())
+            except ValueError:
+                self.write_to_screen("Usage: history [N]", "red")
+                return
+        start = max(0, len(entries) - count)
+        self.write_to_screen(
+            "\n".join(
+                f"{idx}: {cmd}" for idx, cmd in enumerate(entries[start:], start + 1)
+            )
+        )
+
+    @command("jobs")
+    def show_jobs(self):
+        if not self.jobs:
+            self.write_to_screen("Job control is not available.", "red")
+            return
+        jobs = self.jobs.list_jobs()
+        if not jobs:
+            self.write_to_screen("No jobs.")
+            return
+        for job in jobs:
+            mode = "&" if job.background else ""
+            self.write_to_screen(f"[{job.id}] {job.status:<8} {job.command} {mode}")
+
+    def parse_job_id(self, arg):
+        arg = arg.strip().lstrip("%")
+        if not arg:
+            return None
+        if not arg.isdigit():
+            raise ValueError(f"Invalid job id '{arg}'.")
+        return int(arg)
+
+    @command("kill")
+    def kill_job(self, arg):
+        if not self.jobs:
+            self.write_to_screen("Job control is not available.", "red")
+            return
+        if not arg.strip():
+            self.write_to_screen("Usage: kill %<job id>", "red")
+            return
+        job = self.jobs.kill(self.parse_job_id(arg))
+        if job is None:
+            self.write_to_screen(f"kill: {arg}: no such job", "red")
+        else:
+            self.write_to_screen(f"[{job.id}] Killed   {job.command}")
 
-    def show_logs(self):
+    @command("fg")
+    def foreground_job(self, arg):
+        if not self.jobs:
+            self.write_to_screen("Job control is not available.", "red")
+            return
+        job = self.jobs.get(self.parse_job_id(arg))
+        if job is None:
+            self.write_to_screen("fg: no such job", "red")
+            return
+        self.write_to_screen(job.command, "gray")
+        job.foreground()
+
+    def parse_logs_args(self, args):
+        value_flags = {
+            "--since": "since",
+            "--user": "user",
+            "--status": "status",
+            "--grep": "grep",
+            "--tail": "tail",
+            "--date": "date",
+        }
+        import shlex
+
+        options = {"all": False}
+        # Double quotes group a value with spaces, e.g. --grep "line 1999".
+        tokens = [token.strip('"') for token in shlex.split(args, posix=False)]
+        while tokens:
+            token = tokens.pop(0)
+            if token == "--all":
+                options["all"] = True
+            elif token in value_flags:
+                if not tokens:
+                    raise ValueError(f"Option '{token}' needs a value.")
+                options[value_flags[token]] = tokens.pop(0)
+            else:
+                raise ValueError(f"Unknown option '{token}'.")
+        if "tail" in options:
+            if not options["tail"].isdigit():
+                raise ValueError("--tail needs a number.")
+            options["tail"] = int(options["tail"])
+        return options
+
+    @command("logs")
+    def show_logs(self, args="", background=False):
         if not self.logger:
             self.write_to_screen("Logging is not available.", "red")
             return
+        try:
+            options = self.parse_logs_args(args)
+        except ValueError as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen(
+                "Usage: logs [--since HH:MM] [--user NAME] [--status STATUS] "
+                "[--grep TEXT] [--tail N] [--date YYYY-MM-DD | --all]",
+                "red",
+            )
+            return
+        if not args.strip():
+            options["tail"] = 100
+
+        log_files = None
+        if options["all"]:
+            log_files = self.logger.list_all_logs()
+        elif "date" in options:
+            log_files = self.logger.logs_for_date(options["date"])
+            if not log_files:
+                self.write_to_screen(f"No logs for {options['date']}.", "red")
+                return
+
+        logger = self.logger
+
+        def logs_job(job):
+            entries = logger.query(
+                since=options.get("since"),
+                user=options.get("user"),
+                status=options.get("status"),
+                grep=options.get("grep"),
+                tail=options.get("tail"),
+                log_files=log_files,
+            )
+            job.write("--- Command Logs ---")
+            for i in range(0, len(entries), self.page_lines):
+                job.write("\n".join(entries[i : i + self.page_lines]))
+            job.write(f"{len(entries)} matching entries", "gray")
+
+        self.run_job(f"logs {args}".strip(), logs_job, background)
+
+
+class TkinterCLI(CommandShell):
+    """The command prompt window: a CommandShell whose sink is the Tk output widget."""
+
+    interactive = True
+
+    def __init__(self, root):
+        self.root = root
+        self.closed = False
+        startup_profile.mark("tk init")
+        super().__init__()
+        history_file = self.ini_settings.get(
+            "History", "file", fallback="~/.pyterm_history"
+        )
+        self.history = CommandHistory(
+            os.path.expanduser(history_file) if history_file else None,
+            self.history.max_entries,
+        )
+        self.history_pos = None
+        self.saved_input = ""
+        self.search_query = None
+        self.search_pos = None
+        self.search_match = None
+        self.completion = None
+        startup_profile.mark("config")
+
+        width = self.ini_settings.get("WindowSettings", "width", fallback="850")
+        height = self.ini_settings.get("WindowSettings", "height", fallback="550")
+        title = self.ini_settings.get(
+            "WindowSettings", "title", fallback="Python Command Prompt"
+        )
+
+        self.root.title(title)
+        self.root.geometry(f"{width}x{height}")
+
+        bg_color = self.theme["background"]
+        text_color = self.theme["text"]
+        caret_color = self.theme["caret"]
+
+        self.root.configure(bg=bg_color)
+
+        if job_manager.available():
+            self.jobs = job_manager.JobManager(
+                max_workers=self.ini_settings.getint(
+                    "Performance", "max_jobs", fallback=4
+                )
+            )
+        self.refresh_rate = self.ini_settings.getint(
+            "Performance", "refresh_rate_ms", fallback=16
+        )
+
+        self.output = scrolledtext.ScrolledText(
+            root,
+            bg=bg_color,
+            fg=text_color,
+            insertbackground=caret_color,
+            font=("Consolas", 11),
+        )
+        self.output.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        self.output.config(state=tk.DISABLED)
+        self.output.vbar.config(command=self.on_output_scrollbar)
+        for sequence in ("<MouseWheel>", "<Button-5>"):
+            self.output.bind(sequence, self.on_output_wheel)
+        self.writer = (
+            output_writer.OutputWriter(
+                self.output,
+                self.root,
+                self.refresh_rate,
+                max_lines=self.ini_settings.getint(
+                    "WindowSettings", "scrollback_lines", fallback=10000
+                ),
+            )
+            if output_writer.available()
+            else None
+        )
+        self.sink = self.writer
+
+        self.input_frame = tk.Frame(root, bg=bg_color)
+        self.input_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        self.prompt_label = tk.Label(
+            self.input_frame,
+            text=">",
+            bg=bg_color,
+            fg=self.theme["prompt"],
+            font=("Consolas", 12, "bold"),
+        )
+        self.prompt_label.pack(side=tk.LEFT)
+
+        self.entry = tk.Entry(
+            self.input_frame,
+            bg=bg_color,
+            fg=text_color,
+            insertbackground=caret_color,
+            font=("Consolas", 12),
+            borderwidth=0,
+        )
+        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.entry.bind("<Return>", self.process_command)
+        self.entry.bind("<Next>", lambda event: self.show_more_output())
+        self.entry.bind("<Up>", lambda event: self.recall_history(-1))
+        self.entry.bind("<Down>", lambda event: self.recall_history(1))
+        self.entry.bind("<Control-r>", self.search_history)
+        self.entry.bind("<KeyRelease>", self.update_history_search)
+        self.entry.bind("<Escape>", self.cancel_history_search)
+        self.entry.bind("<Tab>", self.complete_input)
+        self.entry.focus_set()
+
+        self.match_label = tk.Label(
+            self.input_frame,
+            bg=bg_color,
+            fg="gray60",
+            font=("Consolas", 12),
+        )
+
+        if self.jobs:
+            self.root.after(self.refresh_rate, self.pump_job_output)
+
+        startup_profile.mark("widgets")
+
+        # Startup commands run from the event loop once the window is up, one
+        # per callback, so a slow command never delays the first paint.
+        self.startup_queue = list(self.json_config.get("startup_commands", []))
+        self.root.after(0, self.first_paint)
+
+        self.config_poll_ms = self.ini_settings.getint(
+            "Performance", "config_poll_ms", fallback=1000
+        )
+        if self.config_poll_ms > 0:
+            self.root.after(self.config_poll_ms, self.poll_config)
+
+    def first_paint(self):
+        self.root.update_idletasks()
+        startup_profile.mark("first paint")
+        if not self.startup_queue:
+            self.show_ver()
+            self.write_to_screen("(c) Microsoft Corporation. All rights reserved.\n")
+        self.root.after(0, self.run_next_startup_command)
+
+    def run_next_startup_command(self):
+        if self.startup_queue:
+            self.run_silent_command(self.startup_queue.pop(0))
+            self.root.after(0, self.run_next_startup_command)
+            return
+        startup_profile.mark("startup commands")
+        startup_profile.report(
+            self.ini_settings.getint("Performance", "startup_budget_ms", fallback=0)
+        )
+
+    def poll_config(self):
+        """Hot reload: one stat per config file, a re-parse only when one changed."""
+        if self.loader.has_changed():
+            changes = self.apply_config()
+            if changes:
+                self.write_to_screen(
+                    f"Configuration reloaded ({len(changes)} changes).", "gray"
+                )
+        self.root.after(self.config_poll_ms, self.poll_config)
+
+    @command("reload", interactive=True)
+    def reload_config(self):
+        changes = self.apply_config()
+        if not changes:
+            self.write_to_screen("No configuration changes.", "gray")
+            return
+        self.write_to_screen("Configuration reloaded:", "gray")
+        for change in changes:
+            self.write_to_screen(f"  {change}", "gray")
+
+    def apply_config(self):
+        """
+        Re-read the config files and apply theme and window settings live.
+
+        Logging and job pool settings only take effect on the next start.
+
+        Returns:
+            list: Changed settings as reported by the loader
+        """
+        changes = self.loader.reload()
+        if not changes:
+            return changes
+        self.json_config = self.loader.load_json_config()
+        self.ini_settings = self.loader.load_ini_settings()
+        self.theme = self.loader.load_css_theme()
+
+        bg_color = self.theme["background"]
+        text_color = self.theme["text"]
+        caret_color = self.theme["caret"]
+        self.root.configure(bg=bg_color)
+        self.input_frame.configure(bg=bg_color)
+        self.prompt_label.configure(bg=bg_color, fg=self.theme["prompt"])
+        self.match_label.configure(bg=bg_color)
+        for widget in (self.output, self.entry):
+            widget.configure(bg=bg_color, fg=text_color, insertbackground=caret_color)
+
+        settings = self.ini_settings
+        self.root.title(
+            settings.get("WindowSettings", "title", fallback="Python Command Prompt")
+        )
+        width = settings.get("WindowSettings", "width", fallback="850")
+        height = settings.get("WindowSettings", "height", fallback="550")
+        if any(".width" in c or ".height" in c for c in changes):
+            self.root.geometry(f"{width}x{height}")
+        self.page_lines = settings.getint("WindowSettings", "page_lines", fallback=200)
+        self.refresh_rate = settings.getint(
+            "Performance", "refresh_rate_ms", fallback=16
+        )
+        if self.writer:
+            self.writer.interval_ms = self.refresh_rate
+            self.writer.set_max_lines(
+                settings.getint("WindowSettings", "scrollback_lines", fallback=10000)
+            )
+        return changes
 
-        logs = self.logger.get_today_logs()
-        self.write_to_screen("--- Today's Command Logs ---")
-        self.write_to_screen(logs)
+    def emit(self, text, color):
+        if color is None:
+            color = self.current_color
+
+        if color == "red":
+            color = self.theme["error"]
+        elif color == "gray":
+            color = "gray60"
+
+        if self.writer:
+            self.writer.write(text + "\n", color)
+            return
+
+        self.output.config(state=tk.NORMAL)
+
+        tag_name = f"color_{color}".replace("#", "hex")
+        self.output.tag_config(tag_name, foreground=color)
+        self.output.insert(tk.END, text + "\n", tag_name)
+
+        self.output.see(tk.END)
+        self.output.config(state=tk.DISABLED)
+
+    def pump_job_output(self):
+        for text, color in self.jobs.drain():
+            self.write_to_screen(text, color)
+        self.root.after(self.refresh_rate, self.pump_job_output)
+
+    def process_command(self, event):
+        if self.search_query is not None:
+            match = self.end_history_search()
+            self.set_entry(self.saved_input if match is None else match)
+        self.history_pos = None
+        user_input = self.entry.get().strip()
+        self.entry.delete(0, tk.END)
+
+        if not user_input:
+            if self.pager:
+                self.show_more_output()
+            return
+
+        self.close_pager()
+        self.write_to_screen(f"{os.getcwd()}> {user_input}", color=self.theme["prompt"])
+        self.run_line(user_input)
+        if dir_listing.available():
+            # The next Tab most likely completes in the (new) current directory.
+            dir_listing.directory_lister.prefetch(os.curdir)
+
+    def recall_history(self, step):
+        """Up/Down: walk back through earlier commands, then back to the typed text."""
+        if self.search_query is not None:
+            match = self.end_history_search()
+            if match is not None:
+                self.set_entry(match)
+            return "break"
+        entries = self.history.entries()
+        if self.history_pos is None:
+            if step > 0 or not entries:
+                return "break"
+            self.saved_input = self.entry.get()
+            self.history_pos = len(entries)
+        self.history_pos = max(0, self.history_pos + step)
+        if self.history_pos >= len(entries):
+            self.history_pos = None
+            self.set_entry(self.saved_input)
+        else:
+            self.set_entry(entries[self.history_pos])
+        return "break"
+
+    def complete_input(self, event=None):
+        """
+        Tab: complete the last word typed; further Tabs cycle through matches.
+
+        A directory that has not been indexed yet is scanned on a background
+        thread and the completion finishes when the index is ready.
+        """
+        text = self.entry.get()
+        state = self.completion
+        if state and state["text"] == text and state["candidates"]:
+            state["index"] = (state["index"] + 1) % len(state["candidates"])
+            self.apply_completion(state, state["candidates"][state["index"]])
+            return "break"
+        self.completion = None
+
+        result = self.complete_line(text, cached_only=True)
+        if result is None:
+            pending = {"text": text, "candidates": None}
+            self.completion = pending
+
+            def retry(tries=1):
+                if self.completion is not pending or self.entry.get() != text:
+                    return  # typed on, or another Tab took over
+                result = self.complete_line(text, cached_only=True)
+                if result is None:
+                    if tries < 1000:  # give up on a scan that never finishes
+                        self.root.after(10, retry, tries + 1)
+                    return
+                self.completion = None
+                self.show_completion(text, *result)
+
+            self.root.after(10, retry)
+            return "break"
+        self.show_completion(text, *result)
+        return "break"
+
+    def show_completion(self, text, stem, candidates):
+        if not candidates:
+            self.root.bell()
+            return
+        if len(candidates) == 1:
+            completed = candidates[0]
+            if not completed.endswith(os.sep):
+                completed += '" ' if stem.count('"') % 2 else " "
+            self.set_entry(stem + completed)
+            return
+        common = len(os.path.commonprefix([c.lower() for c in candidates]))
+        if common > len(text) - len(stem):
+            # Extend to the shared prefix first; the next Tab starts cycling.
+            self.set_entry(stem + candidates[0][:common])
+            return
+        self.completion = {"stem": stem, "candidates": candidates, "index": 0}
+        self.apply_completion(self.completion, candidates[0])
+
+    def apply_completion(self, state, completed):
+        state["text"] = state["stem"] + completed
+        self.set_entry(state["text"])
+
+    def set_entry(self, text):
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, text)
+        self.entry.icursor(tk.END)
+
+    def search_history(self, event=None):
+        """
+        Ctrl+R: incremental reverse search; typing narrows it, Ctrl+R again
+        finds the next older match, Enter runs it and Escape gives up.
+        """
+        if self.search_query is None:
+            self.saved_input = self.entry.get()
+            self.search_query = ""
+            self.search_pos = None
+            self.search_match = None
+            self.prompt_label.configure(text="(reverse-i-search)")
+            self.match_label.pack(side=tk.RIGHT)
+            self.set_entry("")
+        elif self.search_query:
+            pos, match = self.history.search(self.search_query, self.search_pos)
+            if match is not None:
+                self.search_pos, self.search_match = pos, match
+                self.match_label.configure(text=match)
+        return "break"
+
+    def update_history_search(self, event):
+        if self.search_query is None or self.entry.get() == self.search_query:
+            return
+        self.search_query = self.entry.get()
+        self.search_pos, self.search_match = self.history.search(self.search_query)
+        self.match_label.configure(text=self.search_match or "(no match)")
+
+    def cancel_history_search(self, event=None):
+        if self.search_query is not None:
+            self.end_history_search()
+            self.set_entry(self.saved_input)
+        return "break"
+
+    def end_history_search(self):
+        """Leave search mode; returns the matched command, or None."""
+        match = self.search_match
+        self.search_query = None
+        self.search_pos = None
+        self.search_match = None
+        self.prompt_label.configure(text=">")
+        self.match_label.configure(text="")
+        self.match_label.pack_forget()
+        return match
+
+    def clear_output(self):
+        if self.writer:
+            self.writer.clear()
+            return
+        self.output.config(state=tk.NORMAL)
+        self.output.delete("1.0", tk.END)
+        self.output.config(state=tk.DISABLED)
+
+    def output_columns(self):
+        return int(self.output.cget("width"))
+
+    @command("quit", "q", "exit", interactive=True)
+    def quit_app(self):
+        self.close()
+
+    def close(self):
+        """Closing the window and `exit` both end up here; safe to call twice."""
+        if self.closed:
+            return
+        self.closed = True
+        super().close()
+        self.root.destroy()
+
+    @command("top", requires=top_view, interactive=True)
+    def show_top(self, args):
+        if not task_manager.TaskManager.has_proc():
+            self.write_to_screen("top needs /proc; use tasklist instead.", "red")
+            return
+        options = {"interval": 1.0, "rows": 40}
+        tokens = args.split()
+        try:
+            while tokens:
+                flag = tokens.pop(0)
+                if flag == "-d" and tokens:
+                    options["interval"] = max(0.2, float(tokens.pop(0)))
+                elif flag == "-n" and tokens:
+                    options["rows"] = int(tokens.pop(0))
+                else:
+                    raise ValueError(f"Invalid argument '{flag}'.")
+        except ValueError as e:
+            self.write_to_screen(f"Error: {e}", "red")
+            self.write_to_screen("Usage: top [-d SECONDS] [-n ROWS]", "red")
+            return
+        top_view.TopWindow(self.root, **options)
+        self.write_to_screen("Opening live process view (c/m/p sort, q close)...")
+
+    @command("explorer", requires=file_explorer, interactive=True)
+    def open_explorer(self):
+        file_explorer.FileExplorerPopup(self.root)
+        self.write_to_screen("Opening File Explorer window...")
+
+    def open_pager(self, path):
+        """Show the first screenful of a file and load the rest as the view is scrolled."""
+        self.close_pager()
+        try:
+            pager = file_pager.FilePager(path, self.page_lines)
+        except Exception as e:
+            self.write_to_screen(f"Error reading file: {e}", "red")
+            return
+        if not pager.has_more():
+            pager.close()
+            self.write_to_screen("(File is empty)")
+            return
+        self.start_pager(pager)
+
+    def start_pager(self, pager):
+        """Page any object with has_more/next_page/close, e.g. a piped `| more`."""
+        self.close_pager()
+        self.pager = pager
+        self.show_more_output()
+        if self.pager:
+            self.write_to_screen(MORE_PROMPT, "gray")
+
+    def show_more_output(self):
+        if not self.pager:
+            return
+        try:
+            lines = self.pager.next_page()
+        except Exception as e:
+            self.close_pager()
+            self.write_to_screen(f"Error reading file: {e}", "red")
+            return
+        if lines:
+            self.write_to_screen("\n".join(lines))
+        if not self.pager.has_more():
+            self.close_pager()
+
+    def close_pager(self):
+        if self.pager:
+            self.pager.close()
+            self.pager = None
+
+    def on_output_scrollbar(self, *args):
+        self.output.yview(*args)
+        self.load_page_at_bottom()
+
+    def on_output_wheel(self, event):
+        if getattr(event, "delta", 0) <= 0:
+            self.root.after_idle(self.load_page_at_bottom)
+
+    def load_page_at_bottom(self):
+        if self.pager and self.output.yview()[1] >= 1.0:
+            self.show_more_output()
+
+
+class BatchShell(CommandShell):
+    def __init__(self, sink=None):
+        """
+        Runs command lines without Tk, for scripts and `main.py -c`.
+
+        Jobs run inline, so every command has finished (and its output is
+        in order) before the next one starts.
+        """
+        super().__init__(sink or output_sink.StreamSink())
+
+    def run(self, lines):
+        """
+        Run command lines in order; blank lines, '#', '::' and 'rem' are skipped.
+
+        `exit [N]` stops the script. Without N, and at the end of the script,
+        the exit code is 1 if any command reported an error, otherwise 0.
+
+        Returns:
+            int: Exit code
+        """
+        status = 0
+        flush_each = self.sink.isatty()
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith(("#", "::")):
+                    continue
+                parts = line.split(maxsplit=1)
+                cmd = parts[0].lower()
+                if cmd == "rem":
+                    continue
+                if cmd in ("exit", "quit", "q"):
+                    code = parts[1].strip() if len(parts) > 1 else ""
+                    return int(code) if code.lstrip("-").isdigit() else status
+                self.failed = False
+                self.run_line(line)
+                if self.failed:
+                    status = 1
+                if flush_each:
+                    self.sink.flush()
+            return status
+        finally:
+            self.sink.flush()
+
+
+# After every built-in command is registered, so a plugin never shadows one.
+registry.discover_plugins(tools_dir)
+
+
+def batch_main(argv):
+    """
+    Entry point for `main.py --batch script.txt` and `main.py -c "cmd; cmd"`.
+
+    -c splits on semicolons outside quotes, so `echo "a;b"` stays one command.
+
+    Returns:
+        int: Process exit code; 2 for usage errors, 130 when interrupted
+    """
+    if argv[:1] == ["-c"] and len(argv) > 1:
+        text = " ".join(argv[1:])
+        if pipeline.available():
+            lines = pipeline.split_commands(text)
+        else:
+            lines = text.split(";")
+    elif argv[:1] == ["--batch"] and len(argv) == 2:
+        if argv[1] == "-":
+            lines = sys.stdin
+        else:
+            try:
+                with open(argv[1], "r", encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except OSError as e:
+                print(f"Error: Cannot read script: {e}", file=sys.stderr)
+                return 2
+    else:
+        print('Usage: main.py --batch <script.txt|-> | -c "cmd; cmd"', file=sys.stderr)
+        return 2
+
+    shell = BatchShell()
+    try:
+        return shell.run(lines)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        shell.close()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] in (["--batch"], ["-c"]):
+        sys.exit(batch_main(sys.argv[1:]))
+
+    startup_profile.enabled = "--startup-profile" in sys.argv[1:]
     root = tk.Tk()
     app = TkinterCLI(root)
-
-    def on_closing():
-        if app.logger:
-            app.logger.log_session_end()
-        root.destroy()
-
-    root.protocol("WM_DELETE_WINDOW", on_closing)
-    root.mainloop()
+    root.protocol("WM_DELETE_WINDOW", app.close)
+    try:
+        root.mainloop()
+    finally:
+        # Also covers mainloop ending some other way, e.g. Ctrl+C.
+        app.close()
@@ -0,0 +1,295 @@
+import ast
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "int": int,
+    "float": float,
+    "sqrt": math.sqrt,
+    "cbrt": lambda x: math.copysign(abs(x) ** (1 / 3), x),
+    "exp": math.exp,
+    "log": math.log,
+    "ln": math.log,
+    "log2": math.log2,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "atan2": math.atan2,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "hypot": math.hypot,
+    "degrees": math.degrees,
+    "radians": math.radians,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "trunc": math.trunc,
+    "factorial": math.factorial,
+    "gcd": math.gcd,
+    "lcm": math.lcm,
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+    "inf": math.inf,
+    "nan": math.nan,
+}
+
+# Operators whose cost is bounded by the size of their operands; the
+# expensive ones (*, **, <<) and functions (factorial, round, lcm) are
+# checked before they run.
+CHEAP_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.RShift: operator.rshift,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+}
+
+
+class Calculator:
+    def __init__(self, max_digits=4300, timeout=1.0, cache_size=4096):
+        """
+        Arithmetic on a parsed expression tree instead of eval.
+
+        Only numbers, the operators above, FUNCTIONS, CONSTANTS and variables
+        are accepted. Every multiplication, power, shift, factorial, round
+        and lcm is checked against max_digits before it runs, so a result can never get
+        big enough to stall the terminal, and evaluation stops once timeout
+        seconds have passed. Parsed expressions are compiled to closures and
+        kept in an LRU cache, so repeated expressions skip the parser.
+
+        Args:
+            max_digits (int): Largest integer result, in decimal digits
+            timeout (float): Seconds one expression may take
+            cache_size (int): Compiled expressions to keep
+        """
+        self.max_digits = max_digits
+        self.max_bits = int(max_digits * math.log2(10))
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.variables = {"ans": 0}
+        self._cache = OrderedDict()
+        self._deadline = None
+        self._lock = threading.Lock()
+        self._checked = {
+            "factorial": self._factorial,
+            "round": self._round,
+            "lcm": self._lcm,
+        }
+
+    def evaluate(self, text):
+        """
+        Evaluate an expression, or `name = expression` to set a variable.
+
+        The result is also stored in `ans`.
+
+        Raises:
+            ValueError: For invalid expressions and exceeded limits
+            ZeroDivisionError: On division by zero
+        """
+        with self._lock:
+            return self._evaluate(text)
+
+    def _evaluate(self, text):
+        target, compiled = self.compile(text.strip())
+        self._deadline = time.perf_counter() + self.timeout
+        try:
+            value = compiled()
+        except OverflowError:
+            raise ValueError("Result is too large.") from None
+        except RecursionError:
+            raise ValueError("Expression is too complex.") from None
+        except TypeError as e:
+            raise ValueError(str(e)) from None
+        if isinstance(value, complex):
+            raise ValueError("Result is not a real number.")
+        if target:
+            self.variables[target] = value
+        self.variables["ans"] = value
+        return value
+
+    def compile(self, text):
+        """Parse and compile text; returns (assigned variable or None, closure)."""
+        cached = self._cache.get(text)
+        if cached:
+            self._cache.move_to_end(text)
+            return cached
+        if not text:
+            raise ValueError("Provide a math expression.")
+        if len(text) > 10_000:
+            raise ValueError("Expression is too long.")
+        try:
+            tree = ast.parse(text, mode="exec")
+            if len(tree.body) != 1:
+                raise ValueError("Enter one expression at a time.")
+            statement = tree.body[0]
+            target = None
+            if isinstance(statement, ast.Assign):
+                if len(statement.targets) != 1 or not isinstance(
+                    statement.targets[0], ast.Name
+                ):
+                    raise ValueError("Only single variables can be assigned.")
+                target = statement.targets[0].id
+                if target in FUNCTIONS or target in CONSTANTS:
+                    raise ValueError(f"'{target}' cannot be assigned.")
+            elif not isinstance(statement, ast.Expr):
+                raise ValueError("Not an expression.")
+            compiled = (target, self._compile(statement.value))
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {e.msg}") from None
+        except RecursionError:
+            raise ValueError("Expression is too complex.") from None
+
+        self._cache[text] = compiled
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def _compile(self, node):
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Unsupported value {value!r}.")
+            return lambda: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in CONSTANTS:
+                value = CONSTANTS[name]
+                return lambda: value
+            if name in FUNCTIONS:
+                raise ValueError(f"'{name}' is a function; call it as {name}(...).")
+            variables = self.variables
+
+            def lookup():
+                try:
+                    return variables[name]
+                except KeyError:
+                    raise ValueError(f"Unknown variable '{name}'.") from None
+
+            return lookup
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            op = UNARY_OPERATORS[type(node.op)]
+            operand = self._compile(node.operand)
+            return lambda: op(operand())
+
+        if isinstance(node, ast.BinOp):
+            left = self._compile(node.left)
+            right = self._compile(node.right)
+            op_type = type(node.op)
+            if op_type in CHEAP_OPERATORS:
+                op = CHEAP_OPERATORS[op_type]
+            elif op_type is ast.Mult:
+                op = self._multiply
+            elif op_type is ast.Pow:
+                op = self._power
+            elif op_type is ast.LShift:
+                op = self._shift
+            else:
+                raise ValueError(f"Unsupported operator {op_type.__name__}.")
+            check = self._check_time
+            return lambda: op(left(), check(right()))
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                raise ValueError("Only plain function calls are supported.")
+            name = node.func.id
+            if name not in FUNCTIONS:
+                raise ValueError(f"Unknown function '{name}'.")
+            func = self._checked.get(name, FUNCTIONS[name])
+            args = [self._compile(arg) for arg in node.args]
+            check = self._check_time
+            return lambda: check(func(*[arg() for arg in args]))
+
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}.")
+
+    def _check_time(self, value):
+        if time.perf_counter() > self._deadline:
+            raise ValueError(f"Calculation took longer than {self.timeout:g}s.")
+        return value
+
+    def _bits(self, value):
+        return abs(value).bit_length() if isinstance(value, int) else 0
+
+    def _too_large(self):
+        return ValueError(f"Result would exceed {self.max_digits} digits.")
+
+    def _multiply(self, a, b):
+        if self._bits(a) + self._bits(b) > self.max_bits:
+            raise self._too_large()
+        return a * b
+
+    def _power(self, base, exponent):
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+            if abs(base) > 1 and exponent * math.log2(abs(base)) > self.max_bits:
+                raise self._too_large()
+        return base**exponent
+
+    def _shift(self, value, count):
+        if isinstance(count, int) and self._bits(value) + count > self.max_bits:
+            raise self._too_large()
+        return value << count
+
+    def _factorial(self, n):
+        if not isinstance(n, int) or n < 0:
+            raise ValueError("factorial() needs a non-negative integer.")
+        if math.lgamma(n + 1) / math.log(2) > self.max_bits:
+            raise self._too_large()
+        return math.factorial(n)
+
+    def _round(self, value, ndigits=None):
+        if ndigits is None:
+            return round(value)
+        if isinstance(value, int) and isinstance(ndigits, int):
+            # int.__round__ builds 10**-ndigits; past max_digits the answer
+            # is always 0 since no allowed integer is that long.
+            if ndigits < -self.max_digits:
+                return 0
+        return round(value, ndigits)
+
+    def _lcm(self, *values):
+        result = 1
+        for value in values:
+            if not isinstance(value, int):
+                raise ValueError("lcm() needs integers.")
+            if self._bits(result) + self._bits(value) > self.max_bits:
+                raise self._too_large()
+            result = math.lcm(result, value)
+            self._check_time(result)
+        return result
+
+
+def format_result(value, base=10):
+    """Render a result in base 10, 16 (0x...), 2 (0b...) or 8 (0o...)."""
+    if base == 10:
+        return str(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError("Only whole numbers can be shown in another base.")
+        value = int(value)
+    return {16: hex, 2: bin, 8: oct}[base](value)
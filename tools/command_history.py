@@ -0,0 +1,145 @@
+import bisect
+import os
+from collections import OrderedDict
+
+
+class CommandHistory:
+    def __init__(self, path=None, max_entries=10000):
+        """
+        Deduplicated command history, shared across sessions through a file.
+
+        Each command is appended to the file with a single write; the file is
+        only read the first time the history is looked at. Re-running a
+        command moves it to the end instead of storing it twice, and only
+        the newest max_entries commands are kept.
+
+        Args:
+            path (str): History file, None to keep history in memory only
+            max_entries (int): Number of distinct commands kept
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None if path else OrderedDict()
+        self._file = None
+        # Search index: lowercased entries joined by newlines, oldest first,
+        # with the offset where each entry starts.
+        self._blob = None
+        self._offsets = None
+        self._order = None
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        entries = OrderedDict()
+        lines_read = 0
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line:
+                        entries.pop(line, None)
+                        entries[line] = None
+                        lines_read += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Could not read history: {e}")
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._entries = entries
+        if lines_read > 2 * self.max_entries:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file with just the kept entries once it has doubled in size."""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(entry + "\n" for entry in self._entries)
+            if self._file:
+                self._file.close()
+                self._file = None
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not compact history: {e}")
+
+    def add(self, text):
+        text = text.strip()
+        if not text or "\n" in text:
+            return
+        if self.path:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    # Line buffered: every command is one append to the file.
+                    self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._file.write(text + "\n")
+            except OSError as e:
+                print(f"Warning: History is not saved: {e}")
+                self._load()
+                self.path = None
+        if self._entries is not None:
+            self._entries.pop(text, None)
+            self._entries[text] = None
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._order = None
+            self._blob = None
+
+    def entries(self):
+        """
+        All kept commands, oldest first.
+
+        The list is built once per change and shared between calls, so
+        Up/Down can index it on every key press; do not modify it.
+        """
+        self._load()
+        if self._order is None:
+            self._order = list(self._entries)
+        return self._order
+
+    def __len__(self):
+        self._load()
+        return len(self._entries)
+
+    def search(self, query, before=None):
+        """
+        Find the newest command containing query, ignoring case.
+
+        The index is rebuilt after the history changes; a search is then a
+        single str.rfind over the joined entries plus a bisect.
+
+        Args:
+            query (str): Substring to look for
+            before (int): Only consider entries older than this position
+
+        Returns:
+            tuple: (position in entries(), command), or (None, None)
+        """
+        self._load()
+        if not query:
+            return None, None
+        if self._blob is None:
+            self.entries()
+            self._offsets = []
+            offset = 0
+            for entry in self._order:
+                self._offsets.append(offset)
+                offset += len(entry) + 1
+            self._blob = "\n".join(self._order).lower()
+        if before is None or before >= len(self._order):
+            end = len(self._blob)
+        elif before <= 0:
+            return None, None
+        else:
+            end = self._offsets[before] - 1
+        pos = self._blob.rfind(query.lower(), 0, end)
+        if pos == -1:
+            return None, None
+        index = bisect.bisect_right(self._offsets, pos) - 1
+        return index, self._order[index]
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -1,28 +1,371 @@
+import atexit
+import bisect
+import gzip
+import operator
 import os
-from datetime import datetime
+import queue
+import shutil
+import re
+import threading
+import time
+from collections import deque
+from itertools import islice
+from datetime import datetime, timedelta
+
+DURABILITY_MODES = ("none", "flush", "fsync")
+
+LOG_NAME_PATTERN = re.compile(
+    r"^commands_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.(?:log|log\.gz|idx)$"
+)
+
+ENTRY_PATTERN = re.compile(
+    rb"^\[\d{4}-\d{2}-\d{2} (\d{2}:\d{2}:\d{2})\](?: \[([^\]]*)\])? \[([A-Z_]+)\] "
+)
+
+_STOP = object()
+
+# Gap between wanted entries that query reads through rather than seeking
+# past, and the most it reads in one go.
+READ_GAP = 4096
+MAX_READ = 1024 * 1024
+
+
+class _Index:
+    """Parsed sidecar index, one list per field, sorted by offset."""
+
+    __slots__ = (
+        "ino",
+        "mtime",
+        "read_to",
+        "covered",
+        "offsets",
+        "lengths",
+        "times",
+        "users",
+        "statuses",
+    )
+
+    def __init__(self, ino=None):
+        self.ino = ino
+        self.mtime = None
+        self.read_to = 0
+        self.covered = 0
+        self.offsets = []
+        self.lengths = []
+        self.times = []
+        self.users = []
+        self.statuses = []
+
+    def add(self, data):
+        """Parse appended index lines; data ends at a line break."""
+        text = data.decode("utf-8", "ignore")
+        if text.startswith("-\t") or "\n-\t" in text:
+            # Take out the "-<tab>covered" lines written by _repair_index.
+            text = "\n" + text
+            kept = []
+            start = 0
+            while True:
+                mark = text.find("\n-\t", start)
+                if mark == -1:
+                    break
+                kept.append(text[start:mark])
+                start = text.index("\n", mark + 1)
+                self.covered = max(self.covered, int(text[mark + 3 : start]))
+            kept.append(text[start:])
+            text = "".join(kept)[1:]
+        # Every record line has five fields, so one split of the whole text
+        # gives each column as a strided slice.
+        fields = text.replace("\n", "\t").split("\t")[:-1]
+        if len(fields) % 5:
+            fields = [
+                field
+                for line in text.splitlines()
+                if line.count("\t") == 4
+                for field in line.split("\t")
+            ]
+        if not fields:
+            return
+        offsets = list(map(int, fields[0::5]))
+        in_order = (not self.offsets or self.offsets[-1] < offsets[0]) and all(
+            map(operator.lt, offsets, offsets[1:])
+        )
+        self.offsets += offsets
+        self.lengths += map(int, fields[1::5])
+        self.times += fields[2::5]
+        self.users += fields[3::5]
+        self.statuses += fields[4::5]
+        if not in_order:
+            self._sort()
+        self.covered = max(self.covered, self.offsets[-1] + self.lengths[-1])
+
+    def _sort(self):
+        """
+        Restore offset order after another writer's batch landed out of it,
+        dropping entries indexed twice (by their writer and by a repair).
+        """
+        offsets = self.offsets
+        order = sorted(range(len(offsets)), key=offsets.__getitem__)
+        order = [
+            i
+            for n, i in enumerate(order)
+            if not n or offsets[i] != offsets[order[n - 1]]
+        ]
+        for name in ("offsets", "lengths", "times", "users", "statuses"):
+            column = getattr(self, name)
+            setattr(self, name, [column[i] for i in order])
+
 
 class CommandLogger:
-    def __init__(self, log_dir="logs"):
-        """Initialize the logger and create logs directory if needed."""
+    def __init__(
+        self,
+        log_dir="logs",
+        flush_interval=0.2,
+        durability="flush",
+        max_bytes=10 * 1024 * 1024,
+        retention_days=None,
+    ):
+        """
+        Initialize the logger and create logs directory if needed.
+
+        Entries are queued and written in batches by a background thread,
+        so logging never blocks the caller on file I/O.
+
+        Args:
+            log_dir (str): Directory for the daily log files
+            flush_interval (float): Seconds the writer collects entries per batch
+            durability (str): After each batch: "fsync" forces it to disk;
+                "none" and "flush" leave that to the OS (every batch is one
+                unbuffered append write either way)
+            max_bytes (int): Size at which the active log becomes a gzipped
+                segment, 0 to rotate by date only
+            retention_days (int): Days of logs kept by the automatic sweep,
+                None to keep everything
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
         self.log_dir = log_dir
         self.log_file = None
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
         self.setup_logging()
 
+        self._queue = queue.Queue()
+        self._index_lock = threading.Lock()
+        self._index_cache = {}
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="command-logger", daemon=True
+        )
+        self._writer.start()
+        # The writer is a daemon thread; without this, entries still waiting
+        # for the next batch are lost on any exit that skips close().
+        atexit.register(self.close)
+
+    def _write(self, text, meta=None):
+        """
+        Hand an entry to the writer thread.
+
+        meta is the (time, user, status) triple recorded in the offset index;
+        lines without it (session markers) are written but not indexed.
+        """
+        if self._closed:
+            print(f"Logging error: logger is closed, dropped entry: {text.strip()}")
+            return
+        self._queue.put((text, meta))
+
+    def _collect_batch(self):
+        """Block for one item, then gather whatever arrives within flush_interval."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not _STOP and not isinstance(batch[-1], threading.Event):
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _segment_path(self, date):
+        """Next free commands_<date>.<n>.log name for a rotated segment."""
+        numbers = [0]
+        for name in os.listdir(self.log_dir):
+            match = LOG_NAME_PATTERN.match(name)
+            if match and match.group(1) == date and match.group(2):
+                numbers.append(int(match.group(2)))
+        return os.path.join(self.log_dir, f"commands_{date}.{max(numbers) + 1}.log")
+
+    def _rotate(self, f, idx):
+        """Close the active log, turn it into a numbered segment and start a new one."""
+        with self._index_lock:
+            f.close()
+            idx.close()
+            segment = self._segment_path(self._date)
+            os.replace(self.log_file, segment)
+            if os.path.exists(self.index_path(self.log_file)):
+                os.replace(self.index_path(self.log_file), self.index_path(segment))
+            self.setup_logging()
+        threading.Thread(
+            target=self._housekeeping, args=([segment],), daemon=True
+        ).start()
+        return self._open_active_log()
+
+    def _housekeeping(self, segments):
+        """Gzip rotated segments and apply retention; runs off the writer thread."""
+        for segment in segments:
+            try:
+                with open(segment, "rb") as src:
+                    with gzip.open(segment + ".gz.tmp", "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.replace(segment + ".gz.tmp", segment + ".gz")
+                os.remove(segment)
+            except Exception as e:
+                print(f"Logging error: could not compress {segment}: {e}")
+        if self.retention_days is not None:
+            self.clear_old_logs(self.retention_days)
+
+    def _uncompressed_segments(self):
+        """Rotated segments left uncompressed, e.g. by an exit during compression."""
+        segments = []
+        for name in os.listdir(self.log_dir):
+            match = LOG_NAME_PATTERN.match(name)
+            if match and match.group(2) and name.endswith(".log"):
+                segments.append(os.path.join(self.log_dir, name))
+        return segments
+
+    def _open_active_log(self):
+        """
+        Open the log and its index for appending, indexing any unindexed tail.
+
+        Both are unbuffered so every batch is a single append write; other
+        processes (a second window, a `main.py -c` run) may be appending to
+        the same files, and the writer reads each batch's offset back from
+        where its own write landed.
+        """
+        with self._index_lock:
+            self._repair_index(self.log_file)
+            f = open(self.log_file, "ab", buffering=0)
+            idx = open(self.index_path(self.log_file), "ab", buffering=0)
+        return f, idx
+
+    def _rotated_away(self, f):
+        """True if another process has rotated the file that f appends to."""
+        try:
+            return not os.path.samestat(os.fstat(f.fileno()), os.stat(self.log_file))
+        except OSError:
+            return True
+
+    def _writer_loop(self):
+        try:
+            f, idx = self._open_active_log()
+            threading.Thread(
+                target=self._housekeeping,
+                args=(self._uncompressed_segments(),),
+                daemon=True,
+            ).start()
+        except Exception as e:
+            print(f"Logging error: {e}")
+            f = idx = None
+        while True:
+            batch = self._collect_batch()
+            entries = [item for item in batch if isinstance(item, tuple)]
+            try:
+                if entries:
+                    if f is not None and self._rotated_away(f):
+                        f.close()
+                        idx.close()
+                        self.setup_logging()
+                        f = None
+                    if f is None:
+                        f, idx = self._open_active_log()
+                    elif self._date != datetime.now().strftime("%Y-%m-%d") or (
+                        self.max_bytes
+                        and os.fstat(f.fileno()).st_size >= self.max_bytes
+                    ):
+                        f, idx = self._rotate(f, idx)
+                    chunks = []
+                    index_lines = []
+                    position = 0
+                    for text, meta in entries:
+                        data = text.encode("utf-8")
+                        if meta:
+                            index_lines.append((position, len(data), "\t".join(meta)))
+                        chunks.append(data)
+                        position += len(data)
+                    with self._index_lock:
+                        f.write(b"".join(chunks))
+                        # O_APPEND put the batch at the end of the file as it
+                        # was then, wherever other writers had left it.
+                        start = f.tell() - position
+                        idx.write(
+                            "".join(
+                                f"{start + offset}\t{length}\t{fields}\n"
+                                for offset, length, fields in index_lines
+                            ).encode("utf-8")
+                        )
+                if f is not None and self.durability != "none":
+                    f.flush()
+                    idx.flush()
+                    if self.durability == "fsync":
+                        os.fsync(f.fileno())
+                        os.fsync(idx.fileno())
+            except Exception as e:
+                print(f"Logging error: {e}")
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    if f is not None:
+                        f.flush()
+                        idx.flush()
+                    item.set()
+            if batch[-1] is _STOP:
+                if f is not None:
+                    f.close()
+                    idx.close()
+                return
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is in the log file."""
+        if self._closed or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write out pending entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+
     def setup_logging(self):
         """Create logs directory and initialize log file."""
 
         if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+            os.makedirs(self.log_dir, exist_ok=True)
             print(f"Created logs directory: {self.log_dir}")
 
         today = datetime.now().strftime("%Y-%m-%d")
+        self._date = today
         self.log_file = os.path.join(self.log_dir, f"commands_{today}.log")
 
         if not os.path.exists(self.log_file):
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                f.write("=" * 70 + "\n")
-                f.write(f"Command Log - {today}\n")
-                f.write("=" * 70 + "\n\n")
+            try:
+                # "x", not "w": another process may have just created it.
+                with open(self.log_file, "x", encoding="utf-8") as f:
+                    f.write("=" * 70 + "\n")
+                    f.write(f"Command Log - {today}\n")
+                    f.write("=" * 70 + "\n\n")
+            except FileExistsError:
+                pass
 
     def log_command(self, command, username=None, status="SUCCESS"):
         """
@@ -43,8 +386,9 @@ class CommandLogger:
 
             log_entry += f" [{status}] {command}\n"
 
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._write(
+                log_entry, (timestamp[11:], self._index_field(username), status)
+            )
 
         except Exception as e:
             print(f"Logging error: {e}")
@@ -56,8 +400,7 @@ class CommandLogger:
             log_entry = f"[{timestamp}] [ERROR] {command}\n"
             log_entry += f"    └─> Error: {error_message}\n"
 
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._write(log_entry, (timestamp[11:], "", "ERROR"))
 
         except Exception as e:
             print(f"Logging error: {e}")
@@ -66,8 +409,7 @@ class CommandLogger:
         """Log the start of a new session."""
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"\n--- Session Started: {timestamp} ---\n")
+            self._write(f"\n--- Session Started: {timestamp} ---\n")
         except Exception as e:
             print(f"Logging error: {e}")
 
@@ -75,51 +417,294 @@ class CommandLogger:
         """Log the end of a session."""
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"--- Session Ended: {timestamp} ---\n\n")
+            self._write(f"--- Session Ended: {timestamp} ---\n\n")
         except Exception as e:
             print(f"Logging error: {e}")
 
     def get_today_logs(self):
-        """Read and return today's log contents."""
+        """Read and return today's log contents, including rotated segments."""
+        self.flush()
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, "r", encoding="utf-8") as f:
-                    return f.read()
-            else:
+            names = self.logs_for_date(self._date)
+            if not names:
                 return "No logs for today."
+            contents = []
+            for name in names:
+                with self._open_log(os.path.join(self.log_dir, name)) as f:
+                    contents.append(f.read().decode("utf-8", errors="ignore"))
+            return "".join(contents)
         except Exception as e:
             return f"Error reading logs: {e}"
 
+    @staticmethod
+    def _open_log(path):
+        """Open a log segment for binary reading, decompressing .gz transparently."""
+        if path.endswith(".gz"):
+            return gzip.open(path, "rb")
+        return open(path, "rb")
+
+    @staticmethod
+    def _sort_key(name):
+        """Chronological order: by date, numbered segments before the active file."""
+        match = LOG_NAME_PATTERN.match(name)
+        if not match:
+            return (name, 0)
+        return (match.group(1), int(match.group(2) or 1 << 30))
+
+    @staticmethod
+    def index_path(log_path):
+        """Sidecar index for a log file: one line per entry with its byte range."""
+        if log_path.endswith(".gz"):
+            log_path = log_path[:-3]
+        return os.path.splitext(log_path)[0] + ".idx"
+
+    @staticmethod
+    def _index_field(value):
+        return re.sub(r"[\t\r\n]", " ", value or "")
+
+    def _read_index(self, idx_path):
+        """
+        Load an index file, reusing what earlier queries parsed.
+
+        Indexes only ever grow, so while the file is the same one (same
+        inode) only the lines appended since the last read are parsed.
+        Call with _index_lock held.
+
+        Returns:
+            _Index: Entries sorted by offset and the log bytes covered
+        """
+        try:
+            st = os.stat(idx_path)
+        except FileNotFoundError:
+            self._index_cache.pop(idx_path, None)
+            return _Index()
+        index = self._index_cache.get(idx_path)
+        if index is not None and index.ino == st.st_ino:
+            if index.mtime == st.st_mtime_ns:
+                return index
+        if index is None or index.ino != st.st_ino or st.st_size < index.read_to:
+            index = self._index_cache[idx_path] = _Index(st.st_ino)
+        with open(idx_path, "rb") as f:
+            f.seek(index.read_to)
+            data = f.read(st.st_size - index.read_to)
+        # A line still being written is left for the next read.
+        end = data.rfind(b"\n") + 1
+        index.add(data[:end])
+        index.read_to += end
+        index.mtime = st.st_mtime_ns if end == len(data) else None
+        return index
+
+    @staticmethod
+    def _scan_entries(log_path, start):
+        """Parse entries from start to EOF; indented lines continue the entry above."""
+        records = []
+        current = None
+        offset = start
+        with CommandLogger._open_log(log_path) as f:
+            f.seek(start)
+            for line in f:
+                if current and line.startswith(b"    "):
+                    current[1] += len(line)
+                else:
+                    match = ENTRY_PATTERN.match(line)
+                    current = None
+                    if match:
+                        user = (match.group(2) or b"").decode("utf-8", "ignore")
+                        current = [
+                            offset,
+                            len(line),
+                            match.group(1).decode(),
+                            user,
+                            match.group(3).decode(),
+                        ]
+                        records.append(current)
+                offset += len(line)
+        return records, offset
+
+    def _repair_index(self, log_path):
+        """Index whatever part of a log the sidecar does not cover yet."""
+        if not os.path.exists(log_path):
+            return
+        idx_path = self.index_path(log_path)
+        if log_path.endswith(".gz") and os.path.exists(idx_path):
+            # Segments are indexed completely before they are compressed.
+            return
+        covered = self._read_index(idx_path).covered
+        if not log_path.endswith(".gz") and covered >= os.path.getsize(log_path):
+            return
+        records, end = self._scan_entries(log_path, covered)
+        lines = ["\t".join(str(field) for field in record) + "\n" for record in records]
+        lines.append(f"-\t{end}\n")
+        with open(idx_path, "ab") as idx:
+            idx.write("".join(lines).encode("utf-8"))
+
+    def _load_index(self, log_path):
+        with self._index_lock:
+            # The writer keeps the active log's index current itself.
+            if os.path.abspath(log_path) != os.path.abspath(self.log_file):
+                self._repair_index(log_path)
+            return self._read_index(self.index_path(log_path))
+
+    def query(
+        self,
+        since=None,
+        user=None,
+        status=None,
+        grep=None,
+        tail=None,
+        log_files=None,
+    ):
+        """
+        Return log entries matching every given filter.
+
+        Time, user and status are matched against the sidecar index, so only
+        the byte ranges of candidate entries are read from the log files,
+        neighbouring ones in a single read. With tail the index is walked
+        backwards from the newest entry and stops once enough have matched.
+
+        Args:
+            since (str): Earliest time of day, HH:MM or HH:MM:SS
+            user (str): Exact username
+            status (str): Status such as SUCCESS or ERROR (case-insensitive)
+            grep (str): Case-insensitive substring of the entry text
+            tail (int): Only the last N matching entries
+            log_files (list): File names from list_all_logs, default today's logs
+        """
+        self.flush()
+        if since and since.count(":") == 1:
+            since += ":00"
+        if since:
+            since = ":".join(part.zfill(2) for part in since.split(":"))
+        status = status.upper() if status else None
+        needle = grep.lower() if grep else None
+        names = sorted(log_files or self.logs_for_date(self._date), key=self._sort_key)
+        if tail:
+            names.reverse()
+
+        results = deque()
+        for name in names:
+            path = os.path.join(self.log_dir, name)
+            if not os.path.exists(path):
+                continue
+            index = self._load_index(path)
+            # Entries are indexed in time order, so --since is a bisect.
+            start = bisect.bisect_left(index.times, since) if since else 0
+            count = len(index.offsets)
+            positions = range(count - 1, start - 1, -1) if tail else range(start, count)
+            users, statuses = index.users, index.statuses
+            candidates = (
+                (index.offsets[i], index.lengths[i])
+                for i in positions
+                if (user is None or users[i] == user)
+                and (status is None or statuses[i] == status)
+            )
+            with self._open_log(path) as f:
+                if path.endswith(".gz"):
+                    # gzip can only seek by decompressing; segments are bounded
+                    # by max_bytes, so read the whole thing once instead.
+                    data = f.read()
+
+                    def read(offset, length):
+                        return data[offset : offset + length]
+
+                else:
+
+                    def read(offset, length):
+                        f.seek(offset)
+                        return f.read(length)
+
+                while True:
+                    batch = list(islice(candidates, max(tail or 0, 1024)))
+                    if not batch:
+                        break
+                    if tail:
+                        batch.reverse()
+                    texts = self._read_entries(read, batch)
+                    if needle:
+                        texts = [t for t in texts if needle in t.lower()]
+                    if not tail:
+                        results.extend(texts)
+                        continue
+                    for text in reversed(texts):
+                        results.appendleft(text)
+                        if len(results) >= tail:
+                            return list(results)
+        return list(results)
+
+    @staticmethod
+    def _read_entries(read, records):
+        """
+        Text of each (offset, length) record, sorted by offset.
+
+        Neighbouring entries are read together: one read covers a run of
+        records as long as the gaps between them stay under READ_GAP.
+        """
+        texts = []
+        i = 0
+        while i < len(records):
+            start = records[i][0]
+            end = start + records[i][1]
+            j = i + 1
+            while (
+                j < len(records)
+                and records[j][0] - end <= READ_GAP
+                and end - start < MAX_READ
+            ):
+                end = max(end, records[j][0] + records[j][1])
+                j += 1
+            block = read(start, end - start)
+            for offset, length in records[i:j]:
+                raw = block[offset - start : offset - start + length]
+                texts.append(raw.decode("utf-8", errors="ignore").rstrip())
+            i = j
+        return texts
+
     def list_all_logs(self):
-        """List all log files in the logs directory."""
+        """List all log files (plain and gzipped segments) in the logs directory."""
         try:
             if not os.path.exists(self.log_dir):
                 return []
 
-            log_files = [f for f in os.listdir(self.log_dir) if f.endswith(".log")]
-            return sorted(log_files, reverse=True)  # Most recent first
+            log_files = [
+                f
+                for f in os.listdir(self.log_dir)
+                if f.endswith(".log") or f.endswith(".log.gz")
+            ]
+            # Most recent first
+            return sorted(log_files, key=self._sort_key, reverse=True)
         except Exception as e:
             print(f"Error listing logs: {e}")
             return []
 
+    def logs_for_date(self, date):
+        """Log files for one YYYY-MM-DD date, oldest segment first."""
+        return [
+            name
+            for name in reversed(self.list_all_logs())
+            if name.startswith(f"commands_{date}.")
+        ]
+
     def clear_old_logs(self, days_to_keep=30):
-        """Delete log files older than specified days."""
+        """
+        Delete logs (and their indexes) older than specified days.
+
+        Age comes from the date in the file name, so the sweep needs one
+        directory listing and no per-file stat calls.
+        """
         try:
             if not os.path.exists(self.log_dir):
                 return 0
 
             deleted_count = 0
-            current_time = datetime.now()
+            cutoff = (datetime.now() - timedelta(days=days_to_keep)).strftime(
+                "%Y-%m-%d"
+            )
 
             for filename in os.listdir(self.log_dir):
-                if filename.endswith(".log"):
-                    filepath = os.path.join(self.log_dir, filename)
-                    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    age_days = (current_time - file_time).days
-
-                    if age_days > days_to_keep:
-                        os.remove(filepath)
+                match = LOG_NAME_PATTERN.match(filename)
+                if match and match.group(1) < cutoff:
+                    os.remove(os.path.join(self.log_dir, filename))
+                    if not filename.endswith(".idx"):
                         deleted_count += 1
                         print(f"Deleted old log: {filename}")
 
@@ -143,6 +728,12 @@ if __name__ == "__main__":
     print("\n--- Today's Logs ---")
     print(logger.get_today_logs())
 
+    print("\n--- Errors Today ---")
+    for entry in logger.query(status="ERROR"):
+        print(entry)
+
     print("\n--- All Log Files ---")
     for log_file in logger.list_all_logs():
         print(f"  - {log_file}")
+
+    logger.close()
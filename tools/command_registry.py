@@ -0,0 +1,182 @@
+import bisect
+import importlib
+import os
+
+
+class LazyModule:
+    def __init__(self, name):
+        """A tool module that is imported the first time something touches it."""
+        self.name = name
+        self._module = None
+        self._error = None
+
+    def load(self):
+        if self._module is None:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._module = importlib.import_module(self.name)
+            except ImportError as e:
+                print(f"Warning: Could not import {self.name}: {e}")
+                self._error = e
+                raise
+        return self._module
+
+    def available(self):
+        try:
+            self.load()
+            return True
+        except ImportError:
+            return False
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+class PrefixTrie:
+    class _Node:
+        __slots__ = ("children", "words")
+
+        def __init__(self):
+            self.children = {}
+            self.words = []
+
+    def __init__(self):
+        """
+        Trie where every node keeps the sorted words below it.
+
+        Completion candidates for a prefix are therefore found by walking
+        len(prefix) nodes, without visiting the rest of the subtree.
+        """
+        self.root = self._Node()
+
+    def insert(self, word):
+        node = self.root
+        bisect.insort(node.words, word)
+        for char in word:
+            node = node.children.setdefault(char, self._Node())
+            bisect.insort(node.words, word)
+
+    def candidates(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.words
+
+
+class Command:
+    def __init__(self, name, handler, aliases=(), requires=None, interactive=False):
+        self.name = name
+        self.handler = handler
+        self.aliases = tuple(aliases)
+        self.requires = requires
+        self.interactive = interactive
+        code = handler.__code__
+        params = code.co_varnames[: code.co_argcount]
+        self.takes_background = "background" in params
+        # self + one positional means the handler wants the argument string
+        self.takes_args = len([p for p in params if p != "background"]) > 1
+
+    def invoke(self, app, args, background=False):
+        call_args = [app]
+        if self.takes_args:
+            call_args.append(args)
+        if self.takes_background:
+            return self.handler(*call_args, background=background)
+        return self.handler(*call_args)
+
+
+class CommandRegistry:
+    def __init__(self):
+        """Command table built once at startup, with aliases and a prefix trie."""
+        self.commands = {}
+        self.sources = {}
+        self.trie = PrefixTrie()
+        self.plugins = []
+
+    def command(self, name, *aliases, requires=None, interactive=False):
+        """
+        Decorator registering a handler under a name and its aliases.
+
+        The handler receives the argument string if it takes a parameter,
+        and the background flag if it has a `background` parameter.
+
+        Args:
+            name (str): Command name
+            aliases (str): Other names for the same command
+            requires (LazyModule): Tool module the command needs, imported on first use
+            interactive (bool): Command needs the window and is refused in batch mode
+        """
+
+        def decorator(func):
+            self.add(Command(name, func, aliases, requires, interactive))
+            return func
+
+        return decorator
+
+    def source(self, name):
+        """
+        Decorator registering a pipe source for an existing command.
+
+        A source is called as func(app, args, job) and returns a generator of
+        output lines, so `name ... | filter` streams instead of buffering.
+        Argument errors should be raised as ValueError before the first yield.
+        """
+
+        def decorator(func):
+            self.sources[name] = func
+            return func
+
+        return decorator
+
+    def add(self, command):
+        for word in (command.name,) + command.aliases:
+            if word not in self.commands:
+                self.trie.insert(word)
+            self.commands[word] = command
+
+    def discover_plugins(self, tools_dir):
+        """
+        Register every tools/cmd_<name>.py as command <name> without importing it.
+
+        A plugin module defines run(app, args); it is imported on first use.
+        Newly found names are also added to self.plugins.
+        """
+        if not os.path.isdir(tools_dir):
+            return []
+        found = []
+        for filename in sorted(os.listdir(tools_dir)):
+            if filename.startswith("cmd_") and filename.endswith(".py"):
+                name = filename[4:-3].lower()
+                if name and name not in self.commands:
+                    module = LazyModule(filename[:-3])
+
+                    def run_plugin(app, args, module=module):
+                        return module.run(app, args)
+
+                    self.add(Command(name, run_plugin, requires=module))
+                    found.append(name)
+        self.plugins.extend(found)
+        return found
+
+    def complete(self, prefix):
+        """All command names and aliases starting with prefix."""
+        return self.trie.candidates(prefix)
+
+    def lookup(self, word):
+        """
+        Resolve a command by exact name or unambiguous prefix.
+
+        Returns:
+            tuple: (Command or None, list of candidates when ambiguous)
+        """
+        command = self.commands.get(word)
+        if command is not None:
+            return command, []
+        candidates = self.trie.candidates(word)
+        targets = {self.commands[c].name for c in candidates}
+        if len(targets) == 1:
+            return self.commands[candidates[0]], []
+        return None, candidates
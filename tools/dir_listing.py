@@ -0,0 +1,177 @@
+import bisect
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+ListingEntry = namedtuple("ListingEntry", "name is_dir size mtime")
+
+SORT_KEYS = {
+    "n": lambda e: e.name.lower(),
+    "s": lambda e: e.size,
+    "d": lambda e: e.mtime,
+}
+
+
+class DirectoryLister:
+    def __init__(self, max_dirs=64):
+        """
+        Directory listings built from os.scandir and cached per directory mtime.
+
+        A listing is reused until the directory's own mtime changes, which
+        happens whenever an entry is added, removed or renamed. Size changes
+        inside existing files do not touch the directory mtime, so cached
+        sizes can lag until the next structural change.
+        """
+        self.max_dirs = max_dirs
+        self._cache = OrderedDict()
+        self._names = OrderedDict()
+        self._scanning = set()
+        self._lock = threading.Lock()
+
+    def list_dir(self, path="."):
+        """Return the ListingEntry tuples for a directory, unsorted."""
+        key = os.path.realpath(path)
+        mtime = os.stat(key).st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == mtime:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        entries = []
+        with os.scandir(key) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    st = entry.stat()
+                    size = 0 if is_dir else st.st_size
+                    entries.append(ListingEntry(entry.name, is_dir, size, st.st_mtime))
+                except OSError:
+                    entries.append(ListingEntry(entry.name, False, 0, 0))
+        entries = tuple(entries)
+
+        with self._lock:
+            self._cache[key] = (mtime, entries)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_dirs:
+                self._cache.popitem(last=False)
+        return entries
+
+    def sorted_listing(self, path=".", order="n"):
+        """
+        Return (dirs, files) for a directory, each sorted.
+
+        Args:
+            path (str): Directory to list
+            order (str): 'n' name, 's' size, 'd' date; prefix '-' to reverse
+        """
+        reverse = order.startswith("-")
+        key = SORT_KEYS.get(order.lstrip("-"))
+        if key is None:
+            raise ValueError(f"Invalid sort order '{order}'.")
+        entries = self.list_dir(path)
+        dirs = sorted((e for e in entries if e.is_dir), key=key, reverse=reverse)
+        files = sorted((e for e in entries if not e.is_dir), key=key, reverse=reverse)
+        return dirs, files
+
+    def name_index(self, path=".", cached_only=False):
+        """
+        Sorted names in a directory for completion, cached per directory mtime.
+
+        Only scandir's entry types are used, so building the index for a
+        large directory costs no stat per file.
+
+        Args:
+            path (str): Directory to index
+            cached_only (bool): Return None instead of scanning when the
+                cached index is missing or stale
+
+        Returns:
+            tuple: (lowercased names, names) sorted alike, directories ending
+                in os.sep; or None
+        """
+        key = os.path.realpath(path)
+        mtime = os.stat(key).st_mtime_ns
+        with self._lock:
+            cached = self._names.get(key)
+            if cached and cached[0] == mtime:
+                self._names.move_to_end(key)
+                return cached[1]
+        if cached_only:
+            return None
+
+        names = []
+        with os.scandir(key) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                names.append(entry.name + os.sep if is_dir else entry.name)
+        names.sort(key=str.lower)
+        index = (tuple(name.lower() for name in names), tuple(names))
+
+        with self._lock:
+            self._names[key] = (mtime, index)
+            self._names.move_to_end(key)
+            while len(self._names) > self.max_dirs:
+                self._names.popitem(last=False)
+        return index
+
+    def prefetch(self, path="."):
+        """Build the name index for path on a background thread if it is stale."""
+        try:
+            if self.name_index(path, cached_only=True) is not None:
+                return
+        except OSError:
+            return
+        key = os.path.realpath(path)
+        with self._lock:
+            if key in self._scanning:
+                return
+            self._scanning.add(key)
+
+        def scan():
+            try:
+                self.name_index(key)
+            except OSError:
+                pass
+            finally:
+                with self._lock:
+                    self._scanning.discard(key)
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def complete(self, path, prefix, cached_only=False):
+        """
+        Names in path starting with prefix, ignoring case.
+
+        Dot files are only offered when prefix starts with a dot.
+
+        Returns:
+            list: Matching names, or None if cached_only and not indexed yet
+        """
+        index = self.name_index(path, cached_only)
+        if index is None:
+            return None
+        keys, names = index
+        low = prefix.lower()
+        start = bisect.bisect_left(keys, low)
+        end = bisect.bisect_left(keys, low + "\U0010ffff", start)
+        matches = names[start:end]
+        if not prefix.startswith("."):
+            matches = [name for name in matches if not name.startswith(".")]
+        return list(matches)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+                self._names.clear()
+            else:
+                key = os.path.realpath(path)
+                self._cache.pop(key, None)
+                self._names.pop(key, None)
+
+
+directory_lister = DirectoryLister()
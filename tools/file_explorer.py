@@ -1,7 +1,8 @@
-import os
 import tkinter as tk
 from tkinter import messagebox
 
+from dir_listing import directory_lister
+
 
 class FileExplorerPopup:
     def __init__(self, root):
@@ -23,9 +24,10 @@ class FileExplorerPopup:
     def refresh(self):
         self.listbox.delete(0, tk.END)
         try:
-            items = os.listdir(".")
-            for item in items:
-                prefix = "[DIR] " if os.path.isdir(item) else "[FILE] "
-                self.listbox.insert(tk.END, f"{prefix}{item}")
+            dirs, files = directory_lister.sorted_listing(".")
+            items = [f"[DIR] {e.name}" for e in dirs]
+            items += [f"[FILE] {e.name}" for e in files]
+            if items:
+                self.listbox.insert(tk.END, *items)
         except Exception as e:
             messagebox.showerror("Error", f"Could not read directory: {e}")
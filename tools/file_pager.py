@@ -0,0 +1,142 @@
+import mmap
+import os
+
+
+class MappedFile:
+    def __init__(self, path):
+        """
+        Read-only, memory-mapped view of a text file.
+
+        Only the pages that are actually touched are brought into memory,
+        so very large files can be paged through with bounded RAM.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.size
+            else None
+        )
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def decode(raw):
+        return raw.decode("utf-8", errors="ignore").rstrip("\r")
+
+    def read_lines(self, offset, count):
+        """
+        Read up to count lines starting at a byte offset.
+
+        Returns:
+            tuple: (list of decoded lines, offset of the next unread line)
+        """
+        lines = []
+        if self._map is None:
+            return lines, offset
+        # Touching a mapped page past a truncated end raises SIGBUS, so a file
+        # that shrank since it was mapped is only read up to its new size.
+        self.size = min(self.size, os.fstat(self._file.fileno()).st_size)
+        while len(lines) < count and offset < self.size:
+            end = self._map.find(b"\n", offset, self.size)
+            if end == -1:
+                end = self.size
+            lines.append(self.decode(self._map[offset:end]))
+            offset = end + 1
+        return lines, min(offset, self.size)
+
+    def tail_offset(self, count):
+        """Byte offset of the last count lines, found by scanning backwards from EOF."""
+        if self._map is None or count <= 0:
+            return self.size
+        end = self.size
+        if self._map[end - 1 : end] == b"\n":
+            end -= 1
+        for _ in range(count):
+            pos = self._map.rfind(b"\n", 0, end)
+            if pos == -1:
+                return 0
+            end = pos
+        return end + 1
+
+
+class FilePager:
+    def __init__(self, path, page_lines=200):
+        """
+        Hand out a file one page of lines at a time.
+
+        The pager stays open while the user browses, so pages are read with
+        plain reads rather than through a map: a file truncated in the meantime
+        (e.g. by log rotation) just ends the pager instead of the process.
+        """
+        # Unbuffered, so every read sees the file as it is now.
+        self._file = open(path, "rb", buffering=0)
+        self.page_lines = page_lines
+        self.offset = 0
+
+    def has_more(self):
+        return self.offset < os.fstat(self._file.fileno()).st_size
+
+    def next_page(self, count=None):
+        count = count or self.page_lines
+        lines = []
+        buffer = b""
+        while len(lines) < count:
+            self._file.seek(self.offset + len(buffer))
+            block = self._file.read(64 * 1024)
+            if not block:
+                if buffer:  # last line, without a newline
+                    lines.append(MappedFile.decode(buffer))
+                    self.offset += len(buffer)
+                break
+            buffer += block
+            start = 0
+            while len(lines) < count:
+                end = buffer.find(b"\n", start)
+                if end == -1:
+                    break
+                lines.append(MappedFile.decode(buffer[start:end]))
+                start = end + 1
+            self.offset += start
+            buffer = buffer[start:]
+        return lines
+
+    def close(self):
+        self._file.close()
+
+
+def follow(path, cancelled, poll_interval=0.5, start_offset=None):
+    """
+    Yield lines appended to a file until the cancelled event is set.
+
+    Starts at start_offset (default: end of file). A file that shrinks is
+    assumed to have been truncated or rotated and is read from the start.
+    """
+    offset = os.path.getsize(path) if start_offset is None else start_offset
+    partial = b""
+    while not cancelled.is_set():
+        size = os.path.getsize(path)
+        if size < offset:
+            offset = 0
+            partial = b""
+        if size > offset:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = partial + f.read(size - offset)
+            offset = size
+            *complete, partial = data.split(b"\n")
+            for raw in complete:
+                yield MappedFile.decode(raw)
+        else:
+            cancelled.wait(poll_interval)
@@ -0,0 +1,32 @@
+import functools
+import getpass
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def username():
+    """The logged-in user; cheap enough to ask for on every command."""
+    try:
+        return os.getlogin()
+    except OSError:
+        try:
+            return getpass.getuser()
+        except Exception:
+            return "unknown"
+
+
+@functools.lru_cache(maxsize=1)
+def host_facts():
+    """Hostname, user and platform details; computed once per session."""
+    import platform
+    import socket
+
+    return {
+        "hostname": socket.gethostname(),
+        "node": platform.node(),
+        "username": username(),
+        "system": platform.system(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or "Unknown",
+    }
@@ -0,0 +1,179 @@
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Lines a background job keeps for `fg`; older ones are dropped.
+MAX_BUFFERED_LINES = 10_000
+
+
+class Job:
+    def __init__(self, job_id, command, outbox, background=False):
+        """A single command running on the worker pool."""
+        self.id = job_id
+        self.command = command
+        self.background = background
+        self.status = "Pending"
+        self.cancelled = threading.Event()
+        self.process = None
+        self.future = None
+        self.dropped = 0
+        self._buffer = deque(maxlen=MAX_BUFFERED_LINES)
+        self._outbox = outbox
+        self._lock = threading.Lock()
+
+    def write(self, text, color=None):
+        """
+        Send a line of output towards the terminal.
+
+        Foreground jobs stream straight into the outbox, background jobs
+        hold their last MAX_BUFFERED_LINES lines until they are brought
+        back with `fg`.
+        """
+        if self.cancelled.is_set():
+            return
+        with self._lock:
+            if self.background:
+                if len(self._buffer) == MAX_BUFFERED_LINES:
+                    self.dropped += 1
+                self._buffer.append((text, color))
+            else:
+                self._outbox.put((text, color))
+
+    def attach_process(self, process):
+        """Remember a child process so `kill` can terminate it."""
+        self.process = process
+        if self.cancelled.is_set():
+            self._terminate_process()
+
+    def kill(self):
+        """Stop the job: pending jobs never start, running jobs are asked to stop."""
+        self.cancelled.set()
+        with self._lock:
+            self._buffer.clear()
+        if self.future is not None:
+            self.future.cancel()
+        self._terminate_process()
+        if self.status in ("Pending", "Running"):
+            self.status = "Killed"
+
+    def foreground(self):
+        """Switch the job to streaming output and release anything buffered."""
+        with self._lock:
+            self.background = False
+            if self.dropped:
+                self._outbox.put(
+                    (f"[{self.id}] {self.dropped} earlier lines were dropped", "gray")
+                )
+                self.dropped = 0
+            for item in self._buffer:
+                self._outbox.put(item)
+            self._buffer.clear()
+
+    def is_active(self):
+        return self.status in ("Pending", "Running")
+
+    def _terminate_process(self):
+        process = self.process
+        if process is not None and process.poll() is None:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+
+
+class JobManager:
+    def __init__(self, max_workers=4):
+        """
+        Run blocking commands on a bounded thread pool, keyed by job ID.
+
+        Foreground jobs are forgotten as soon as they finish; background
+        jobs stay until `jobs` has reported them or `fg` has taken them over.
+        """
+        self.outbox = queue.Queue()
+        self.jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cli-job"
+        )
+
+    def submit(self, command, func, background=False):
+        """
+        Schedule func(job) on the pool.
+
+        Args:
+            command (str): The command line, shown by `jobs`
+            func (callable): Worker taking the Job; writes output via job.write
+            background (bool): Buffer output until `fg` instead of streaming it
+        """
+        job = Job(next(self._ids), command, self.outbox, background)
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        try:
+            if job.cancelled.is_set():
+                return
+            job.status = "Running"
+            try:
+                func(job)
+                if job.status == "Running":
+                    job.status = "Done"
+            except Exception as e:
+                job.status = "Failed"
+                job.write(f"Execution Error: {e}", "red")
+            if job.background and not job.cancelled.is_set():
+                self.outbox.put((f"[{job.id}] {job.status:<8} {job.command}", "gray"))
+        finally:
+            if not job.background:
+                with self._jobs_lock:
+                    self.jobs.pop(job.id, None)
+
+    def get(self, job_id=None):
+        """Return a job by ID, or the most recent background job when no ID is given."""
+        if job_id is not None:
+            return self.jobs.get(job_id)
+        with self._jobs_lock:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.id, reverse=True)
+        for job in jobs:
+            if job.background and (job.is_active() or job._buffer):
+                return job
+        return None
+
+    def list_jobs(self):
+        """Return all known jobs and forget the ones that have finished."""
+        with self._jobs_lock:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.id)
+            for job in jobs:
+                if not job.is_active() and not job._buffer:
+                    del self.jobs[job.id]
+        return jobs
+
+    def kill(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.kill()
+        return job
+
+    def drain(self, limit=500):
+        """Collect pending output lines; called from the UI thread."""
+        items = []
+        try:
+            while len(items) < limit:
+                items.append(self.outbox.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def shutdown(self):
+        with self._jobs_lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            if job.is_active():
+                job.kill()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,27 +1,295 @@
+import asyncio
+import ipaddress
+import math
+import re
 import socket
+import struct
 import subprocess
 import platform
+import threading
+import time
+
+import host_info
+
+MAX_SWEEP_HOSTS = 65536
+
+SIOCGIFADDR = 0x8915
+
+
+class ResolverCache:
+    def __init__(self, ttl=300, negative_ttl=30, max_entries=1024):
+        """
+        Thread-safe name resolution cache.
+
+        Successful lookups are kept for ttl seconds and failures for
+        negative_ttl seconds, so a slow or broken resolver is only asked
+        once per name per period.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, name):
+        """
+        Return the addresses for a name, most specific first.
+
+        Returns:
+            tuple: (list of address strings, True if served from the cache)
+
+        Raises:
+            socket.gaierror: When the name does not resolve (also when cached)
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(name)
+        if cached and cached[0] > now:
+            if isinstance(cached[1], Exception):
+                raise cached[1]
+            return cached[1], True
+
+        try:
+            infos = socket.getaddrinfo(name, None, proto=socket.IPPROTO_TCP)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            entry = (now + self.ttl, addresses)
+        except socket.gaierror as e:
+            entry = (now + self.negative_ttl, e)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[name] = entry
+        if isinstance(entry[1], Exception):
+            raise entry[1]
+        return entry[1], False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+resolver = ResolverCache()
 
 
 class NetworkTools:
+    @staticmethod
+    def host_facts():
+        return host_info.host_facts()
+
+    @staticmethod
+    def resolve(name):
+        return resolver.resolve(name)
+
     @staticmethod
     def get_ip():
         try:
-            hostname = socket.gethostname()
-            return socket.gethostbyname(hostname)
+            hostname = NetworkTools.host_facts()["hostname"]
+            addresses, _ = resolver.resolve(hostname)
+            ipv4 = [a for a in addresses if ":" not in a]
+            return (ipv4 or addresses)[0]
         except Exception as e:
             return f"Error: {e}"
 
     @staticmethod
-    def ping(host):
+    def interface_addresses():
+        """
+        Return (interface, address) pairs for every local interface.
+
+        Linux reads IPv4 addresses with SIOCGIFADDR and IPv6 ones from
+        /proc/net/if_inet6; elsewhere the host name's addresses are used.
+        """
+        pairs = []
+        if platform.system().lower() == "linux":
+            import fcntl
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                for _, name in socket.if_nameindex():
+                    try:
+                        packed = fcntl.ioctl(
+                            sock.fileno(),
+                            SIOCGIFADDR,
+                            struct.pack("256s", name.encode()[:15]),
+                        )
+                        pairs.append((name, socket.inet_ntoa(packed[20:24])))
+                    except OSError:
+                        pass
+            try:
+                with open("/proc/net/if_inet6", "r") as f:
+                    for line in f:
+                        fields = line.split()
+                        raw = fields[0]
+                        address = ipaddress.IPv6Address(
+                            ":".join(raw[i : i + 4] for i in range(0, 32, 4))
+                        )
+                        pairs.append((fields[5], str(address)))
+            except OSError:
+                pass
+        if not pairs:
+            hostname = NetworkTools.host_facts()["hostname"]
+            try:
+                addresses, _ = resolver.resolve(hostname)
+                pairs = [(hostname, address) for address in addresses]
+            except socket.gaierror:
+                pass
+        return pairs
+
+    @staticmethod
+    def ping(host, on_process=None):
         param = "-n" if platform.system().lower() == "windows" else "-c"
         command = ["ping", param, "4", host]
         try:
-            result = subprocess.run(command, capture_output=True, text=True)
-            return result.stdout
+            process = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+            if on_process:
+                on_process(process)
+            stdout, _ = process.communicate()
+            return stdout
         except Exception as e:
             return f"Ping failed: {e}"
 
+    @staticmethod
+    def expand_targets(targets, host_file=None):
+        """
+        Turn host names, IP addresses and CIDR ranges into a list of hosts.
+
+        Args:
+            targets (list): Hosts and/or networks such as 10.0.0.0/24
+            host_file (str): Optional file with one target per line (# comments)
+        """
+        targets = list(targets)
+        if host_file:
+            with open(host_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    targets.extend(line.split("#", 1)[0].split())
+        hosts = []
+        for target in targets:
+            if "/" in target:
+                network = ipaddress.ip_network(target, strict=False)
+                if network.num_addresses > MAX_SWEEP_HOSTS:
+                    raise ValueError(
+                        f"{target} is larger than {MAX_SWEEP_HOSTS} hosts."
+                    )
+                members = list(network.hosts()) or [network.network_address]
+                hosts.extend(str(ip) for ip in members)
+            else:
+                hosts.append(target)
+        return hosts
+
+    @staticmethod
+    async def _probe_icmp(host, timeout):
+        """One echo request through the system ping binary."""
+        if platform.system().lower() == "windows":
+            command = ["ping", "-n", "1", "-w", str(int(timeout * 1000)), host]
+        else:
+            command = ["ping", "-c", "1", "-W", str(max(1, math.ceil(timeout))), host]
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout + 1)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        if process.returncode != 0:
+            raise ConnectionError("no reply")
+        match = re.search(rb"time[=<]([\d.]+)", stdout)
+        return float(match.group(1)) if match else elapsed
+
+    @staticmethod
+    async def _probe_tcp(host, port, timeout):
+        """Time a TCP connect to host:port."""
+        start = time.perf_counter()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return elapsed
+
+    @staticmethod
+    async def _sweep(hosts, probe, port, concurrency, timeout, on_result, cancelled):
+        limit = asyncio.Semaphore(concurrency)
+        results = []
+
+        async def check(host):
+            async with limit:
+                if cancelled is not None and cancelled.is_set():
+                    return
+                try:
+                    if probe == "tcp":
+                        latency = await NetworkTools._probe_tcp(host, port, timeout)
+                    else:
+                        latency = await NetworkTools._probe_icmp(host, timeout)
+                    result = (host, True, latency)
+                except asyncio.TimeoutError:
+                    result = (host, False, "timed out")
+                except FileNotFoundError:
+                    result = (host, False, "ping command not found")
+                except (OSError, ConnectionError) as e:
+                    result = (host, False, e.strerror or str(e) or "unreachable")
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        await asyncio.gather(*(check(host) for host in hosts))
+        return results
+
+    @staticmethod
+    def sweep(
+        hosts,
+        probe="icmp",
+        port=80,
+        concurrency=64,
+        timeout=1.0,
+        on_result=None,
+        cancelled=None,
+    ):
+        """
+        Probe many hosts concurrently on an asyncio event loop.
+
+        Args:
+            hosts (list): Hosts to check, e.g. from expand_targets
+            probe (str): "icmp" (system ping binary) or "tcp" (connect to port)
+            port (int): Port for TCP probes
+            concurrency (int): Maximum probes in flight at once
+            timeout (float): Seconds before a host counts as unreachable
+            on_result (callable): Called with (host, ok, latency_ms or error)
+                as each probe finishes
+            cancelled (threading.Event): Stops starting new probes when set
+
+        Returns:
+            list: (host, ok, latency_ms or error) in completion order
+        """
+        return asyncio.run(
+            NetworkTools._sweep(
+                hosts, probe, port, concurrency, timeout, on_result, cancelled
+            )
+        )
+
+    @staticmethod
+    def summarize(results):
+        latencies = sorted(r[2] for r in results if r[1])
+        summary = f"{len(latencies)}/{len(results)} hosts reachable"
+        if latencies:
+            p95 = latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)]
+            average = sum(latencies) / len(latencies)
+            summary += (
+                f", latency min/avg/max/p95 = {latencies[0]:.2f}/{average:.2f}/"
+                f"{latencies[-1]:.2f}/{p95:.2f} ms"
+            )
+        return summary
+
     @staticmethod
     def get_public_ip():
         return "Feature requires 'requests' library."
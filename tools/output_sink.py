@@ -0,0 +1,50 @@
+import sys
+
+
+class StreamSink:
+    def __init__(self, stream=None, error_stream=None, buffer_size=65536):
+        """
+        Output sink for running commands without a window.
+
+        Same interface as OutputWriter (write(text, color) and clear()), but
+        text goes to a stream. Writes are joined in memory and handed to the
+        stream in buffer_size chunks, so thousands of short lines cost a
+        handful of write calls instead of one per line.
+
+        Args:
+            stream: Normal output, default sys.stdout
+            error_stream: Text written in "red", default sys.stderr
+            buffer_size (int): Characters to collect before writing them out
+        """
+        self.stream = stream or sys.stdout
+        self.error_stream = error_stream or sys.stderr
+        self.buffer_size = buffer_size
+        self._pending = []
+        self._pending_size = 0
+
+    def write(self, text, color=None):
+        if color == "red":
+            # Keep stdout and stderr in order when both go to a terminal.
+            self.flush()
+            self.error_stream.write(text)
+            return
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def clear(self):
+        pass
+
+    def flush(self):
+        if self._pending:
+            self.stream.write("".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+        self.stream.flush()
+
+    def isatty(self):
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
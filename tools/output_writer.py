@@ -0,0 +1,102 @@
+import tkinter as tk
+
+
+class OutputWriter:
+    def __init__(self, widget, root, interval_ms=16, max_lines=0):
+        """
+        Coalesce writes to a Text widget and flush them once per frame.
+
+        Args:
+            widget: The (normally disabled) Text/ScrolledText to write into
+            root: Tk root used to schedule flushes
+            interval_ms (int): Frame length; pending text is inserted at most this often
+            max_lines (int): Scrollback limit in lines, 0 for unlimited
+        """
+        self.widget = widget
+        self.root = root
+        self.interval_ms = interval_ms
+        # Trim in blocks so the B-tree delete is amortised over many flushes.
+        self.set_max_lines(max_lines)
+        self._pending = []
+        self._pending_lines = 0
+        self._tags = set()
+        self._scheduled = None
+
+    def set_max_lines(self, max_lines):
+        self.max_lines = max_lines
+        self.trim_block = max(100, max_lines // 10)
+
+    def tag_for(self, color):
+        """Return the tag for a colour, configuring it on first use only."""
+        tag_name = f"color_{color}".replace("#", "hex")
+        if tag_name not in self._tags:
+            self.widget.tag_config(tag_name, foreground=color)
+            self._tags.add(tag_name)
+        return tag_name
+
+    def write(self, text, color):
+        """Queue text in the given colour; consecutive writes of one colour are merged."""
+        tag_name = self.tag_for(color)
+        if self._pending and self._pending[-1][0] == tag_name:
+            self._pending[-1][1].append(text)
+        else:
+            self._pending.append((tag_name, [text]))
+        self._pending_lines += text.count("\n")
+        if self._scheduled is None:
+            self._scheduled = self.root.after(self.interval_ms, self.flush)
+
+    def flush(self):
+        """Insert everything pending in a single widget call and scroll once."""
+        self._scheduled = None
+        if not self._pending:
+            return
+        if self.max_lines and self._pending_lines > self.max_lines:
+            self._drop_pending_overflow()
+        args = []
+        for tag_name, chunks in self._pending:
+            args.append("".join(chunks))
+            args.append(tag_name)
+        self._pending = []
+        self._pending_lines = 0
+
+        self.widget.config(state=tk.NORMAL)
+        self.widget.insert(tk.END, *args)
+        if self.max_lines:
+            self._trim()
+        self.widget.see(tk.END)
+        self.widget.config(state=tk.DISABLED)
+
+    def _trim(self):
+        """Delete the oldest lines once the widget is a full block over the limit."""
+        line_count = int(self.widget.index("end-1c").split(".")[0])
+        excess = line_count - self.max_lines
+        if excess >= self.trim_block:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+
+    def _drop_pending_overflow(self):
+        """Discard queued text that would be trimmed straight away after inserting."""
+        keep = []
+        kept_lines = 0
+        for tag_name, chunks in reversed(self._pending):
+            kept_chunks = []
+            for chunk in reversed(chunks):
+                kept_chunks.append(chunk)
+                kept_lines += chunk.count("\n")
+                if kept_lines >= self.max_lines:
+                    break
+            keep.append((tag_name, kept_chunks[::-1]))
+            if kept_lines >= self.max_lines:
+                break
+        self._pending = keep[::-1]
+        self._pending_lines = kept_lines
+
+    def clear(self):
+        """Drop pending output and empty the widget."""
+        if self._scheduled is not None:
+            self.root.after_cancel(self._scheduled)
+            self._scheduled = None
+        self._pending = []
+        self._pending_lines = 0
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete("1.0", tk.END)
+        self.widget.config(state=tk.DISABLED)
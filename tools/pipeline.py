@@ -0,0 +1,273 @@
+import itertools
+import re
+import threading
+from collections import deque
+
+
+def split_pipeline(line):
+    """
+    Split a command line on |, > and >> outside of quotes.
+
+    Returns:
+        tuple: (list of stage strings, (mode, path) or None), mode being "w" or "a"
+
+    Raises:
+        ValueError: On an empty stage or a redirect that is not at the end
+    """
+    stages = []
+    current = []
+    redirect = None
+    quote = None
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quote:
+            if char == quote:
+                quote = None
+            current.append(char)
+        elif char in "\"'":
+            quote = char
+            current.append(char)
+        elif char == "|":
+            stages.append("".join(current).strip())
+            current = []
+        elif char == ">":
+            mode = "w"
+            if line[i + 1 : i + 2] == ">":
+                mode = "a"
+                i += 1
+            target = line[i + 1 :].strip()
+            if "|" in target or ">" in target:
+                raise ValueError("Redirection must come last.")
+            target = target.strip("\"'")
+            if not target:
+                raise ValueError("Missing file name after '>'.")
+            redirect = (mode, target)
+            break
+        else:
+            current.append(char)
+        i += 1
+    stages.append("".join(current).strip())
+    if not all(stages):
+        raise ValueError("Empty command in pipeline.")
+    return stages, redirect
+
+
+def split_commands(text):
+    """Split `a; b; c` on semicolons outside of quotes, like split_pipeline."""
+    commands = []
+    current = []
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ";":
+            commands.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    commands.append("".join(current))
+    return commands
+
+
+def _flags(args, known):
+    """Split leading -x or /x flags (case-insensitive) from the rest of args."""
+    flags = set()
+    tokens = args.split()
+    while tokens and tokens[0][:1] in "-/" and tokens[0][1:].lower() in known:
+        flags.add(tokens.pop(0)[1:].lower())
+    return flags, " ".join(tokens)
+
+
+def _count(args, default):
+    """Line count for head/tail: accepts 'N', '-N' and '-n N'."""
+    tokens = args.split()
+    if tokens and tokens[0].lower() in ("-n", "/n"):
+        tokens.pop(0)
+    if not tokens:
+        return default
+    value = tokens[0].lstrip("-")
+    if not value.isdigit():
+        raise ValueError(f"Invalid line count '{tokens[0]}'.")
+    return int(value)
+
+
+def match_filter(lines, args, regex=False):
+    """
+    findstr/grep: keep lines containing a pattern.
+
+    Arguments are checked before any line is read, so a bad pattern is
+    reported before the pipeline starts.
+
+    Flags: -i ignore case, -v keep non-matching lines, -n prefix line numbers,
+    -r treat the pattern as a regular expression (always on for grep).
+    """
+    flags, pattern = _flags(args, {"i", "v", "n", "r"})
+    pattern = pattern.strip("\"'")
+    if not pattern:
+        raise ValueError("Specify a search pattern.")
+    invert = "v" in flags
+    if regex or "r" in flags:
+        try:
+            search = re.compile(pattern, re.IGNORECASE if "i" in flags else 0).search
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from None
+    elif "i" in flags:
+        folded = pattern.lower()
+
+        def search(line):
+            return folded in line.lower()
+
+    else:
+
+        def search(line):
+            return pattern in line
+
+    numbered = "n" in flags
+
+    def run():
+        for number, line in enumerate(lines, 1):
+            if bool(search(line)) != invert:
+                yield f"{number}:{line}" if numbered else line
+
+    return run()
+
+
+def head_filter(lines, args):
+    """head [N]: the first N lines (default 10); upstream stops once they are read."""
+    return itertools.islice(lines, _count(args, 10))
+
+
+def tail_filter(lines, args):
+    """tail [N]: the last N lines (default 10), keeping only N lines in memory."""
+    count = _count(args, 10)
+
+    def run():
+        yield from deque(lines, maxlen=count)
+
+    return run()
+
+
+def sort_filter(lines, args):
+    """sort [-r] [-i]: the only filter that has to hold all of its input."""
+    flags, _ = _flags(args, {"r", "i"})
+    key = str.lower if "i" in flags else None
+
+    def run():
+        yield from sorted(lines, key=key, reverse="r" in flags)
+
+    return run()
+
+
+def wc_filter(lines, args):
+    """wc: line, word and character counts of the input."""
+    line_count = word_count = char_count = 0
+    for line in lines:
+        line_count += 1
+        word_count += len(line.split())
+        char_count += len(line) + 1
+    yield f"{line_count:>8} {word_count:>8} {char_count:>8}"
+
+
+FILTERS = {
+    "findstr": match_filter,
+    "grep": lambda lines, args: match_filter(lines, args, regex=True),
+    "head": head_filter,
+    "tail": tail_filter,
+    "sort": sort_filter,
+    "wc": wc_filter,
+}
+
+# `more` is handled by the caller: it turns the pipeline into a LinePager, or a
+# BackgroundPager when there is a job pool to pull the pages on.
+PAGER = "more"
+
+
+class LinePager:
+    def __init__(self, lines, page_lines=200, on_close=None):
+        """
+        Page through any line iterator with the FilePager interface.
+
+        Lines are only pulled from the pipeline when the next page is asked
+        for; on_close lets the caller release the source (e.g. a mapped file).
+        """
+        self.lines = iter(lines)
+        self.page_lines = page_lines
+        self.on_close = on_close
+        self._peeked = deque()
+
+    def has_more(self):
+        if not self._peeked:
+            self._peeked.extend(itertools.islice(self.lines, 1))
+        return bool(self._peeked)
+
+    def next_page(self, count=None):
+        count = count or self.page_lines
+        page = list(self._peeked)
+        self._peeked.clear()
+        page.extend(itertools.islice(self.lines, count - len(page)))
+        return page
+
+    def close(self):
+        if self.on_close:
+            self.on_close()
+
+
+class BackgroundPager:
+    def __init__(self, page_lines=200):
+        """
+        `| more` for a window: pages are pulled from the pipeline on a job.
+
+        The UI holds this object as its pager; next_page only asks for the
+        next page and returns nothing. The job running feed() pulls the
+        lines, writes them through job.write like any other job output and
+        then waits for the next request, so a filter that has to scan far
+        for its next match never blocks the window.
+        """
+        self.page_lines = page_lines
+        self._wanted = threading.Event()
+        self._finished = False
+        self._closed = False
+
+    def feed(self, job, lines, prompt=None):
+        """Job side: write one page per request until lines run out or close()."""
+        pager = LinePager(lines, self.page_lines)
+        first = True
+        try:
+            while True:
+                while not self._wanted.wait(0.2):
+                    if job.cancelled.is_set():
+                        return
+                self._wanted.clear()
+                if self._closed or job.cancelled.is_set():
+                    return
+                page = pager.next_page()
+                if page:
+                    job.write("\n".join(page))
+                if not pager.has_more():
+                    return
+                if first and prompt:
+                    job.write(prompt, "gray")
+                first = False
+        finally:
+            self._finished = True
+
+    def has_more(self):
+        return not self._finished
+
+    def next_page(self, count=None):
+        self._wanted.set()
+        return []
+
+    def close(self):
+        self._closed = True
+        self._wanted.set()
+
+
+def split_lines(chunks):
+    """Turn written output chunks (which may hold several lines) into lines."""
+    for chunk in chunks:
+        yield from chunk.split("\n")
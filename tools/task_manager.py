@@ -1,12 +1,155 @@
+import fnmatch
 import os
+import signal
 import subprocess
 import platform
+import time
+from collections import namedtuple
+
+ProcessInfo = namedtuple(
+    "ProcessInfo", "pid ppid name state rss cpu_time cpu_percent cmdline"
+)
+
+SORT_KEYS = {
+    "pid": (lambda p: p.pid, False),
+    "name": (lambda p: p.name.lower(), False),
+    "mem": (lambda p: p.rss, True),
+    "cpu": (lambda p: p.cpu_percent, True),
+    "time": (lambda p: p.cpu_time, True),
+}
 
 
 class TaskManager:
+    # pid -> (cpu ticks, monotonic time) from the previous /proc read
+    _last_sample = {}
+
     @staticmethod
-    def list_processes():
+    def has_proc():
+        return platform.system().lower() == "linux" and os.path.isdir("/proc")
+
+    @staticmethod
+    def read_cmdline(pid):
         try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                raw = f.read().replace(b"\0", b" ").decode(errors="replace")
+            return " ".join(raw.split())
+        except OSError:
+            return ""
+
+    @staticmethod
+    def read_proc_table(state=None):
+        """
+        Enumerate processes from /proc/<pid>/stat in a single pass.
+
+        CPU% is the change in CPU ticks since the previous call, so the first
+        call reports 0 for every process. Command lines are not read here;
+        use read_cmdline for the rows that are actually shown.
+
+        Args:
+            state (dict): Sample dict to diff against and update, so separate
+                samplers (e.g. a live top view) do not disturb each other
+        """
+        if state is None:
+            state = TaskManager._last_sample
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        now = time.monotonic()
+        previous = state
+        sample = {}
+        processes = []
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue  # exited while we were scanning
+            # The name may itself contain spaces or parentheses.
+            name_end = data.rfind(b")")
+            name = data[data.find(b"(") + 1 : name_end].decode(errors="replace")
+            fields = data[name_end + 2 :].split()
+            pid = int(entry)
+            ticks = int(fields[11]) + int(fields[12])
+            sample[pid] = (ticks, now)
+            cpu_percent = 0.0
+            if pid in previous:
+                prev_ticks, prev_time = previous[pid]
+                elapsed = now - prev_time
+                if elapsed > 0:
+                    cpu_percent = (
+                        (ticks - prev_ticks) / ticks_per_second / elapsed * 100
+                    )
+            processes.append(
+                ProcessInfo(
+                    pid=pid,
+                    ppid=int(fields[1]),
+                    name=name,
+                    state=fields[0].decode(),
+                    rss=int(fields[21]) * page_size,
+                    cpu_time=ticks / ticks_per_second,
+                    cpu_percent=cpu_percent,
+                    cmdline=None,
+                )
+            )
+        state.clear()
+        state.update(sample)
+        return processes
+
+    @staticmethod
+    def snapshot(sort="pid", name_filter=None, top=None, interval=0.25):
+        """
+        Return ProcessInfo records, sorted and filtered.
+
+        Args:
+            sort (str): pid, name, mem, cpu or time
+            name_filter (str): Glob (python*) or case-insensitive substring
+            top (int): Keep only the first N rows after sorting
+            interval (float): Seconds between the two reads used for CPU% when
+                there is no earlier sample to compare against
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'.")
+        if not TaskManager._last_sample and interval:
+            TaskManager.read_proc_table()
+            time.sleep(interval)
+        processes = TaskManager.read_proc_table()
+
+        if name_filter:
+            pattern = name_filter.lower()
+            if any(c in pattern for c in "*?["):
+                processes = [
+                    p for p in processes if fnmatch.fnmatch(p.name.lower(), pattern)
+                ]
+            else:
+                processes = [p for p in processes if pattern in p.name.lower()]
+
+        key, reverse = SORT_KEYS[sort]
+        processes.sort(key=key, reverse=reverse)
+        if top:
+            processes = processes[:top]
+        return [p._replace(cmdline=TaskManager.read_cmdline(p.pid)) for p in processes]
+
+    @staticmethod
+    def format_table(processes):
+        header = f"{'PID':>7} {'PPID':>7} S {'MEM(MB)':>9} {'CPU%':>6} {'TIME(s)':>9}"
+        lines = [f"{header}  COMMAND"]
+        for p in processes:
+            lines.append(
+                f"{p.pid:>7} {p.ppid:>7} {p.state} {p.rss / 1048576:>9.1f} "
+                f"{p.cpu_percent:>6.1f} {p.cpu_time:>9.1f}  {p.cmdline or p.name}"
+            )
+        lines.append(f"{len(processes)} processes")
+        return "\n".join(lines)
+
+    @staticmethod
+    def list_processes(sort="pid", name_filter=None, top=None):
+        try:
+            if TaskManager.has_proc():
+                return TaskManager.format_table(
+                    TaskManager.snapshot(sort, name_filter, top)
+                )
+
             if platform.system().lower() == "windows":
                 cmd = "tasklist"
             else:
@@ -18,18 +161,135 @@ class TaskManager:
             return f"Failed to list processes: {e}"
 
     @staticmethod
-    def kill_process(pid_or_name):
+    def resolve_targets(targets, tree=False):
+        """
+        Map PIDs and name globs to processes using a single /proc scan.
+
+        Returns:
+            tuple: (ProcessInfo records to signal, targets that matched nothing)
+        """
+        processes = TaskManager.read_proc_table()
+        by_pid = {p.pid: p for p in processes}
+        protected = {1, os.getpid()}
+        selected = {}
+        unmatched = []
+        for target in targets:
+            if target.isdigit():
+                found = [by_pid[int(target)]] if int(target) in by_pid else []
+            else:
+                pattern = target.lower()
+                found = [
+                    p
+                    for p in processes
+                    if p.pid not in protected
+                    and fnmatch.fnmatch(p.name.lower(), pattern)
+                ]
+            if not found:
+                unmatched.append(target)
+            for p in found:
+                selected[p.pid] = p
+
+        if tree:
+            children = {}
+            for p in processes:
+                children.setdefault(p.ppid, []).append(p)
+            stack = list(selected)
+            while stack:
+                for child in children.get(stack.pop(), []):
+                    if child.pid not in selected and child.pid not in protected:
+                        selected[child.pid] = child
+                        stack.append(child.pid)
+        return list(selected.values()), unmatched
+
+    @staticmethod
+    def is_alive(pid):
+        """True while a process exists and is not a zombie."""
         try:
-            if platform.system().lower() == "windows":
-                cmd = (
-                    f"taskkill /f /im {pid_or_name}"
-                    if not pid_or_name.isdigit()
-                    else f"taskkill /f /pid {pid_or_name}"
-                )
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                data = f.read()
+            return data[data.rfind(b")") + 2 : data.rfind(b")") + 3] != b"Z"
+        except OSError:
+            return False
+
+    @staticmethod
+    def kill_processes(targets, tree=False, force=False, timeout=3.0):
+        """
+        Signal processes directly with os.kill, without spawning a shell.
+
+        Sends SIGTERM, waits up to timeout seconds for the processes to exit,
+        then sends SIGKILL to whatever is left. force skips straight to SIGKILL.
+
+        Args:
+            targets (list): PIDs and/or name globs such as python* or worker
+            tree (bool): Also kill every descendant of the matched processes
+            force (bool): Use SIGKILL immediately
+            timeout (float): Grace period between SIGTERM and SIGKILL
+        """
+        if not TaskManager.has_proc():
+            return "\n".join(TaskManager.kill_process(t) for t in targets)
+
+        processes, unmatched = TaskManager.resolve_targets(targets, tree)
+        lines = [f"No process found matching '{t}'." for t in unmatched]
+        first_signal = signal.SIGKILL if force else signal.SIGTERM
+        signalled = []
+        for p in processes:
+            try:
+                os.kill(p.pid, first_signal)
+                signalled.append(p)
+            except ProcessLookupError:
+                pass
+            except PermissionError:
+                lines.append(f"Access denied: {p.name} (PID {p.pid}).")
+
+        pending = [p.pid for p in signalled]
+        deadline = time.monotonic() + (0 if force else timeout)
+        while pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+            pending = [pid for pid in pending if TaskManager.is_alive(pid)]
+
+        killed_hard = set()
+        for pid in pending:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed_hard.add(pid)
+            except OSError:
+                pass
+
+        for p in signalled:
+            if p.pid in killed_hard and not force:
+                lines.append(f"Killed {p.name} (PID {p.pid}) after timeout.")
             else:
-                cmd = f"kill -9 {pid_or_name}"
+                lines.append(f"Terminated {p.name} (PID {p.pid}).")
+        lines.append(f"{len(signalled)} process(es) signalled.")
+        return "\n".join(lines)
 
-            result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+    @staticmethod
+    def kill_process(pid_or_name):
+        """
+        Kill one process on a system without /proc.
+
+        Windows passes the PID or image name to taskkill as an argument
+        list; elsewhere only PIDs can be killed, with os.kill.
+        """
+        if platform.system().lower() == "windows":
+            flag = "/pid" if pid_or_name.isdigit() else "/im"
+            try:
+                result = subprocess.run(
+                    ["taskkill", "/f", flag, pid_or_name],
+                    capture_output=True,
+                    text=True,
+                )
+            except OSError as e:
+                return f"Error killing process: {e}"
             return result.stdout if result.returncode == 0 else result.stderr
-        except Exception as e:
+        if not pid_or_name.isdigit():
+            return f"Killing by name needs /proc; give the PID of '{pid_or_name}'."
+        try:
+            os.kill(int(pid_or_name), signal.SIGKILL)
+        except ProcessLookupError:
+            return f"No process with PID {pid_or_name}."
+        except PermissionError:
+            return f"Access denied: PID {pid_or_name}."
+        except OSError as e:
             return f"Error killing process: {e}"
+        return f"Killed PID {pid_or_name}."
@@ -0,0 +1,144 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from task_manager import SORT_KEYS, TaskManager
+
+COLUMNS = (
+    ("pid", "PID", 70),
+    ("name", "Name", 200),
+    ("state", "S", 30),
+    ("mem", "Mem (MB)", 90),
+    ("cpu", "CPU %", 70),
+    ("time", "Time (s)", 90),
+)
+
+
+class TopWindow:
+    def __init__(self, root, interval=1.0, rows=40, sort="cpu"):
+        """
+        Self-refreshing process view.
+
+        A sampler thread reads /proc every interval seconds and hands the
+        sorted top rows to the UI thread, which only touches the rows whose
+        values or positions changed.
+
+        Keys: c = sort by CPU, m = by memory, p = by PID, q/Escape = close.
+        """
+        self.interval = interval
+        self.rows = rows
+        self.sort = sort
+        self._snapshots = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._items = {}
+
+        self.window = tk.Toplevel(root)
+        self.window.title("top")
+        self.window.geometry("600x700")
+        self.window.configure(bg="#1e1e1e")
+
+        self.status = tk.Label(
+            self.window, anchor="w", bg="#1e1e1e", fg="white", font=("Courier", 10)
+        )
+        self.status.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.table = ttk.Treeview(
+            self.window, columns=[c[0] for c in COLUMNS], show="headings"
+        )
+        for key, title, width in COLUMNS:
+            anchor = "w" if key == "name" else "e"
+            self.table.heading(key, text=title)
+            self.table.column(key, width=width, anchor=anchor)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        for key, sort in (("c", "cpu"), ("m", "mem"), ("p", "pid")):
+            self.window.bind(key, lambda event, sort=sort: self.set_sort(sort))
+        self.window.bind("q", lambda event: self.close())
+        self.window.bind("<Escape>", lambda event: self.close())
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.focus_set()
+
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="top-sampler", daemon=True
+        )
+        self._sampler.start()
+        self.window.after(50, self._poll)
+
+    def set_sort(self, sort):
+        self.sort = sort
+        self._wake.set()
+
+    def _sample_loop(self):
+        state = {}
+        TaskManager.read_proc_table(state)
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            processes = TaskManager.read_proc_table(state)
+            key, reverse = SORT_KEYS[self.sort]
+            processes.sort(key=key, reverse=reverse)
+            rows = [
+                (
+                    str(p.pid),
+                    (
+                        p.pid,
+                        p.name,
+                        p.state,
+                        f"{p.rss / 1048576:.1f}",
+                        f"{p.cpu_percent:.1f}",
+                        f"{p.cpu_time:.1f}",
+                    ),
+                )
+                for p in processes[: self.rows]
+            ]
+            summary = (len(processes), sum(p.cpu_percent for p in processes))
+            try:
+                self._snapshots.get_nowait()
+            except queue.Empty:
+                pass
+            self._snapshots.put((rows, summary))
+
+    def _poll(self):
+        if self._stop.is_set():
+            return
+        try:
+            rows, summary = self._snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self._apply(rows, summary)
+        self.window.after(50, self._poll)
+
+    def _apply(self, rows, summary):
+        """Diff a snapshot against the table and update only what changed."""
+        wanted = {iid for iid, _ in rows}
+        for iid in list(self._items):
+            if iid not in wanted:
+                self.table.delete(iid)
+                del self._items[iid]
+
+        for index, (iid, values) in enumerate(rows):
+            old = self._items.get(iid)
+            if old is None:
+                self.table.insert("", index, iid=iid, values=values)
+            else:
+                if old != values:
+                    self.table.item(iid, values=values)
+                if self.table.index(iid) != index:
+                    self.table.move(iid, "", index)
+            self._items[iid] = values
+
+        count, cpu = summary
+        self.status.config(
+            text=f"{count} processes, {cpu:.1f}% CPU | sort: {self.sort} "
+            f"| every {self.interval:g}s | c/m/p sort, q close"
+        )
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self.window.destroy()
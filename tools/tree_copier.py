@@ -0,0 +1,269 @@
+import errno
+import os
+import shutil
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_ERRORS = 20
+CHUNK = 64 * 1024 * 1024
+
+# Errors meaning "this kernel copy does not work for these files", after
+# which the next method is tried.
+_UNSUPPORTED = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EBADF,
+    errno.ENOTSUP,
+    getattr(errno, "EOPNOTSUPP", errno.ENOTSUP),
+}
+
+
+def _kernel_copy(copy, src_fd, dst_fd, copied, cancelled):
+    """Copy with copy_file_range or sendfile until EOF; returns the bytes copied."""
+    total = 0
+    while cancelled is None or not cancelled.is_set():
+        try:
+            sent = copy(src_fd, dst_fd, CHUNK)
+        except OSError as e:
+            if total == 0 and e.errno in _UNSUPPORTED:
+                return None
+            raise
+        if not sent:
+            break
+        total += sent
+        if copied:
+            copied(sent)
+    return total
+
+
+def _copy_file_range(src_fd, dst_fd, count):
+    return os.copy_file_range(src_fd, dst_fd, count)
+
+
+def _sendfile(src_fd, dst_fd, count):
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+KERNEL_COPIES = []
+if hasattr(os, "copy_file_range"):
+    KERNEL_COPIES.append(_copy_file_range)
+if sys.platform.startswith("linux"):
+    # Only Linux sendfile writes to regular files; elsewhere it needs a socket.
+    KERNEL_COPIES.append(_sendfile)
+
+
+def copy_file(src, dst, copied=None, cancelled=None):
+    """
+    Copy one file's data and timestamps, inside the kernel where possible.
+
+    Tries os.copy_file_range (which can share extents on filesystems that
+    support reflinks), then os.sendfile, then a plain buffered copy.
+
+    Args:
+        src (str): File to copy
+        dst (str): Target file, overwritten if it exists
+        copied (callable): Called with the byte count of every chunk
+        cancelled (threading.Event): Stops the copy between chunks
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        for copy in KERNEL_COPIES:
+            if _kernel_copy(copy, src_fd, dst_fd, copied, cancelled) is not None:
+                break
+        else:
+            while cancelled is None or not cancelled.is_set():
+                chunk = fsrc.read(1024 * 1024)
+                if not chunk:
+                    break
+                fdst.write(chunk)
+                if copied:
+                    copied(len(chunk))
+    shutil.copystat(src, dst)
+
+
+def unchanged(src_stat, dst_path):
+    """True if dst_path has src's size and (within 2s, for FAT) mtime."""
+    try:
+        dst_stat = os.stat(dst_path)
+    except OSError:
+        return False
+    return (
+        dst_stat.st_size == src_stat.st_size
+        and abs(dst_stat.st_mtime - src_stat.st_mtime) <= 2
+    )
+
+
+class TreeCopier:
+    def __init__(
+        self,
+        src,
+        dst,
+        workers=4,
+        recursive=True,
+        update=False,
+        cancelled=None,
+    ):
+        """
+        Copy a file or directory tree with a bounded pool of copy workers.
+
+        One thread walks the source with os.scandir and creates directories;
+        files are queued to the pool as they are found, with at most a few
+        per worker waiting, so huge trees use little memory. Symlinks are
+        recreated, not followed.
+
+        Args:
+            src (str): File or directory to copy
+            dst (str): Target file, or the directory to copy src's contents into
+            workers (int): Files copied at once
+            recursive (bool): Include subdirectories
+            update (bool): Skip files whose size and mtime already match
+            cancelled (threading.Event): Set to stop after the current chunks
+        """
+        self.src = src
+        self.dst = dst
+        self.workers = max(1, workers)
+        self.recursive = recursive
+        self.update = update
+        self.cancelled = cancelled or threading.Event()
+        self.files = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.error_count = 0
+        self.errors = []  # the first MAX_ERRORS messages
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending = 0
+        self._walked = False
+        self._executor = None
+
+    def run(self, progress=None, interval=1.0):
+        """
+        Copy everything, calling progress(self) every interval seconds.
+
+        Returns:
+            bool: True if everything was copied
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="copy"
+        )
+        walker = threading.Thread(target=self._walk, daemon=True)
+        walker.start()
+        try:
+            while True:
+                with self._cond:
+                    finished = self._cond.wait_for(
+                        lambda: self._walked and not self._pending, interval
+                    )
+                if finished:
+                    break
+                if progress:
+                    progress(self)
+        finally:
+            self._executor.shutdown(wait=True)
+        return not self.error_count and not self.cancelled.is_set()
+
+    def _error(self, e):
+        with self._lock:
+            self.error_count += 1
+            if len(self.errors) < MAX_ERRORS:
+                self.errors.append(str(e))
+
+    def _copied(self, count):
+        with self._lock:
+            self.bytes += count
+
+    def _walk(self):
+        try:
+            st = os.stat(self.src)
+            if not stat.S_ISDIR(st.st_mode):
+                self._queue(self.src, self.dst, st)
+                return
+            stack = [(self.src, self.dst)]
+            while stack and not self.cancelled.is_set():
+                src_dir, dst_dir = stack.pop()
+                try:
+                    os.makedirs(dst_dir, exist_ok=True)
+                    with os.scandir(src_dir) as it:
+                        entries = list(it)
+                except OSError as e:
+                    self._error(e)
+                    continue
+                for entry in entries:
+                    if self.cancelled.is_set():
+                        break
+                    target = os.path.join(dst_dir, entry.name)
+                    try:
+                        if entry.is_symlink():
+                            self._copy_link(entry.path, target)
+                        elif entry.is_dir():
+                            if self.recursive:
+                                stack.append((entry.path, target))
+                        else:
+                            self._queue(entry.path, target, entry.stat())
+                    except OSError as e:
+                        self._error(e)
+        except Exception as e:
+            self._error(e)
+        finally:
+            with self._cond:
+                self._walked = True
+                self._cond.notify_all()
+
+    def _copy_link(self, src, dst):
+        link = os.readlink(src)
+        if os.path.lexists(dst):
+            if os.path.islink(dst) and os.readlink(dst) == link:
+                with self._lock:
+                    self.skipped += 1
+                return
+            os.remove(dst)
+        os.symlink(link, dst)
+        with self._lock:
+            self.files += 1
+
+    def _queue(self, src, dst, src_stat):
+        if self.update and unchanged(src_stat, dst):
+            with self._lock:
+                self.skipped += 1
+            return
+        with self._cond:
+            # Bound the queue: the walker waits while every worker has a backlog.
+            self._cond.wait_for(lambda: self._pending < self.workers * 4)
+            self._pending += 1
+        self._executor.submit(self._copy, src, dst)
+
+    def _copy(self, src, dst):
+        try:
+            copy_file(src, dst, self._copied, self.cancelled)
+            if not self.cancelled.is_set():
+                with self._lock:
+                    self.files += 1
+        except Exception as e:
+            self._error(f"{src}: {e}")
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+
+def move(src, dst):
+    """
+    Rename src to dst, atomically when both are on the same filesystem.
+
+    Returns:
+        bool: True if renamed; False if dst is on another device, in which
+            case the caller copies and deletes instead
+    """
+    try:
+        if os.path.isdir(src):
+            os.rename(src, dst)
+        else:
+            os.replace(src, dst)
+        return True
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            return False
+        raise
@@ -0,0 +1,158 @@
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_ERRORS = 20
+
+
+class _Dir:
+    __slots__ = ("path", "parent", "pending")
+
+    def __init__(self, path, parent):
+        self.path = path
+        self.parent = parent
+        # Subdirectories still being removed, plus one for this directory's
+        # own scan; the directory itself goes when this drops to zero.
+        self.pending = 1
+
+
+class TreeRemover:
+    def __init__(self, path, workers=8, dry_run=False, cancelled=None):
+        """
+        Recursive delete on a bounded thread pool.
+
+        Each directory is scanned once with os.scandir; its files are
+        unlinked by the worker that scanned it and its subdirectories are
+        handed to the pool, so unlinks in different directories overlap.
+        A directory is removed as soon as its last subdirectory is gone.
+        Symlinks are removed, never followed.
+
+        Args:
+            path (str): File or directory to remove
+            workers (int): Threads deleting at once
+            dry_run (bool): Only count what would be removed
+            cancelled (threading.Event): Set to stop; what is left stays
+        """
+        self.path = path
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        self.cancelled = cancelled or threading.Event()
+        self.files = 0
+        self.dirs = 0
+        self.bytes = 0
+        self.error_count = 0
+        self.errors = []  # the first MAX_ERRORS messages
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._executor = None
+
+    def run(self, progress=None, interval=1.0):
+        """
+        Remove the tree, calling progress(self) every interval seconds.
+
+        Returns:
+            bool: True if everything was removed (or counted, for a dry run)
+        """
+        try:
+            st = os.lstat(self.path)
+        except OSError as e:
+            self._error(e)
+            return False
+        if not stat.S_ISDIR(st.st_mode):
+            self._add(1, 0, st.st_size)
+            if not self.dry_run:
+                self._unlink(self.path)
+            return not self.error_count
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="rm"
+        )
+        try:
+            self._executor.submit(self._scan, _Dir(self.path, None))
+            while not self._done.wait(interval):
+                if progress:
+                    progress(self)
+        finally:
+            self._executor.shutdown(wait=True)
+        return not self.error_count and not self.cancelled.is_set()
+
+    def _add(self, files, dirs, size):
+        with self._lock:
+            self.files += files
+            self.dirs += dirs
+            self.bytes += size
+
+    def _error(self, e):
+        with self._lock:
+            self.error_count += 1
+            if len(self.errors) < MAX_ERRORS:
+                self.errors.append(str(e))
+
+    def _scan(self, node):
+        files = size = 0
+        try:
+            with os.scandir(node.path) as it:
+                for entry in it:
+                    if self.cancelled.is_set():
+                        break
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            with self._lock:
+                                node.pending += 1
+                            self._executor.submit(self._scan, _Dir(entry.path, node))
+                            continue
+                        entry_size = entry.stat(follow_symlinks=False).st_size
+                    except OSError as e:
+                        self._error(e)
+                        continue
+                    if self.dry_run or self._unlink(entry.path):
+                        files += 1
+                        size += entry_size
+                        if files == 256:
+                            self._add(files, 0, size)
+                            files = size = 0
+        except Exception as e:
+            # Whatever happens, the node must still be finished below or
+            # its parents would never be removed.
+            self._error(e)
+        self._add(files, 0, size)
+        self._finish(node)
+
+    def _finish(self, node):
+        """A scan or subdirectory is done; remove the directories that emptied."""
+        while node is not None:
+            with self._lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+            if not self.cancelled.is_set():
+                try:
+                    if not self.dry_run:
+                        os.rmdir(node.path)
+                    self._add(0, 1, 0)
+                except OSError as e:
+                    self._error(e)
+            if node.parent is None:
+                self._done.set()
+            node = node.parent
+
+    def _unlink(self, path):
+        try:
+            os.unlink(path)
+            return True
+        except PermissionError as e:
+            if os.name == "nt":
+                # Read-only files cannot be deleted on Windows.
+                try:
+                    os.chmod(path, stat.S_IWRITE)
+                    os.unlink(path)
+                    return True
+                except OSError:
+                    pass
+            self._error(e)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            self._error(e)
+        return False
@@ -0,0 +1,97 @@
+import fnmatch
+import os
+import re
+
+DEFAULT_IGNORE = (".git", "node_modules", "__pycache__")
+
+
+class TreeWalker:
+    def __init__(self, root, max_depth=None, dirs_only=False, ignore=DEFAULT_IGNORE):
+        """
+        Depth-limited directory walker built on os.scandir.
+
+        Args:
+            root (str): Directory to list
+            max_depth (int): Levels below root to show (0: just root), None for all
+            dirs_only (bool): Skip files (and their stat calls) entirely
+            ignore (iterable): fnmatch patterns for files and directories to
+                leave out; ignored directories are not descended into
+        """
+        self.root = root
+        self.max_depth = max_depth
+        self.dirs_only = dirs_only
+        self.ignore = tuple(ignore)
+        # One regex for all patterns, since every entry is checked.
+        self._ignored = (
+            re.compile("|".join(fnmatch.translate(p) for p in self.ignore)).match
+            if self.ignore
+            else None
+        )
+        self.dir_count = 0
+        self.file_count = 0
+        self.total_bytes = 0
+
+    def is_ignored(self, name):
+        return self._ignored is not None and bool(
+            self._ignored(os.path.normcase(name))
+        )
+
+    def walk(self, cancelled=None):
+        """
+        Yield tree lines as they are discovered.
+
+        Each directory is scanned once and only when its level is within
+        max_depth, so pruned subtrees are never touched. Stops early when
+        the cancelled event is set.
+        """
+        root_name = os.path.basename(self.root.rstrip(os.sep)) or self.root
+        stack = [(self.root, 0, root_name)]
+        while stack:
+            if cancelled is not None and cancelled.is_set():
+                return
+            path, level, name = stack.pop()
+            indent = "|   " * level
+            if self.max_depth is not None and level >= self.max_depth:
+                yield f"{indent}|-- {name}/"
+                continue
+
+            dirs = []
+            files = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if not self.is_ignored(entry.name):
+                                dirs.append(entry)
+                        elif not self.dirs_only and not self.is_ignored(entry.name):
+                            files.append(entry)
+            except OSError as e:
+                yield f"{indent}|-- {name}/ [{e.strerror or 'unreadable'}]"
+                continue
+
+            yield f"{indent}|-- {name}/"
+            subindent = "|   " * (level + 1)
+            for entry in sorted(files, key=lambda e: e.name.lower()):
+                try:
+                    self.total_bytes += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+                self.file_count += 1
+                yield f"{subindent}|-- {entry.name}"
+
+            dirs.sort(key=lambda e: e.name.lower(), reverse=True)
+            self.dir_count += len(dirs)
+            for entry in dirs:
+                stack.append((entry.path, level + 1, entry.name))
+
+    def summary(self):
+        if self.dirs_only:
+            return f"{self.dir_count} directories"
+        return (
+            f"{self.dir_count} directories, {self.file_count} files, "
+            f"{self.total_bytes:,} bytes"
+        )